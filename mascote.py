@@ -6,9 +6,11 @@ Funcionalidades:
 - Mascote animado (GIF) exibido na interface.
 - Movimenta o mouse e pressiona teclas periodicamente.
 - Permite configurar o intervalo entre ações.
+- Tarefas independentes (ex.: tecla a cada N s, mouse a cada M s), adicionadas ou removidas pela interface.
 - Emite som opcional a cada ciclo.
 - Registra cada ciclo em um arquivo de log (cycle_log.txt).
 - Interface gráfica fixa, com ícone personalizado.
+- Instância única: uma segunda execução encaminha o comando à instância em execução.
 
 Requisitos:
 - Python 3.x
@@ -18,86 +20,248 @@ Autor: Christian Vladimir Uhdre Mulato
 Data: Campo Largo, segunda-feira, 29 de Setembro de 2025.
 """
 
-import tkinter as tk
-from tkinter import messagebox
+import sys
+
+# --perfil mede as importações desde o início: o cronômetro entra antes delas
+# (sem a opção, mascote_profile nem é importado)
+if __name__ == "__main__" and any(arg.split("=", 1)[0] in ("--perfil", "--profile") for arg in sys.argv[1:]):
+    import mascote_profile
+    mascote_profile.IMPORT_TIMER.install()
+
+import argparse
+import atexit
+import math
 import threading
 import time
-import pyautogui
-import subprocess
-import datetime
-import os
-import random
-from PIL import Image, ImageTk
+from collections import deque
+from mascote_control import (COMMANDS, ControlServer, ControlUnavailable, InstanceRunning, format_reply,
+                             send_command)
+from mascote_engine import CYCLE_JOB, CycleEngine, format_job, parse_job_spec
+from mascote_events import EventStore
+from mascote_input import BACKENDS, create_backend
+from mascote_log import LogWriter
+from mascote_metrics import start_exporters
+from mascote_state import StateChannel
+
+# Intervalo máximo entre atualizações da interface enquanto os ciclos estão ativos (ms)
+UI_REFRESH_MS = 250
+
+# Intervalo padrão entre ciclos (s)
+DEFAULT_INTERVAL = 300
+
+# Tempo máximo que o canal de controle espera a thread do Tk executar um comando (s)
+CONTROL_TIMEOUT = 4.0
+
+# Intervalo em que a thread do Tk procura comandos do canal de controle com os ciclos parados (ms)
+CONTROL_POLL_MS = 500
+
+# Dependência da interface gráfica, importada só quando a janela é criada
+tk = None
+
+
+def load_gui_modules():
+    # O modo --headless nunca chama esta função: tkinter não é carregado
+    # (o PIL vem com mascote_frames, importado só pelo MascoteApp)
+    global tk
+    if tk is None:
+        import tkinter
+        tk = tkinter
 
 class MascoteApp:
-    def __init__(self, root):
+    def __init__(self, root, event_db=None, input_backend=None, interval=DEFAULT_INTERVAL,
+                 sound=False, log_path="cycle_log.txt", metrics_port=None, status_path=None,
+                 jobs=None, points_per_second=None, control=None, skip_when_active=True,
+                 profiler=None):
+        # Quadros do GIF dependem do PIL: importados junto com a interface
+        from mascote_frames import AnimationScheduler, FrameRenderer, open_frames
+        load_gui_modules()
+
         self.root = root
         self.root.title("Move Mascote")
         self.running = False
         self.interval = 5
-        self.remaining = 5
-        self.cycle_count = 0
+        self.ui_job = None
+        self.countdown_text = None
+
+        # Estado publicado pela thread de ciclos e aplicado aos widgets pela thread do Tk
+        self.state = StateChannel()
 
-        # Garante que o arquivo de log exista
-        if not os.path.exists("cycle_log.txt"):
-            with open("cycle_log.txt", "w", encoding="utf-8") as f:
-                f.write("Log de ciclos iniciado.\n")
+        # Gravador assíncrono do log (cria o arquivo se não existir)
+        self.log_writer = LogWriter(log_path)
+        atexit.register(self.log_writer.close)
 
-        # Mascote animado
-        self.frames = []
+        # Armazenamento opcional de eventos tipados (SQLite)
+        self.event_store = None
+        if event_db:
+            self.event_store = EventStore(event_db)
+            atexit.register(self.event_store.close)
+
+        # Motor de ciclos; o backend de entrada é pyautogui ou nulo para rodar sem tela
+        self.engine = CycleEngine(input_backend or create_backend(), self.log_writer,
+                                  self.event_store, state=self.state, jobs=jobs)
+        if points_per_second:
+            self.engine.points_per_second = points_per_second
+        self.profiler = profiler
+        if profiler is not None and profiler.wants_cycles:
+            self.engine.profiler = profiler
+
+        # Exportação opcional das métricas (HTTP local e arquivo de status)
+        self.exporters = start_exporters(self.engine.metrics, metrics_port, status_path)
+
+        # Mascote animado (cache em disco mapeado ou quadros decodificados sob demanda)
+        self.frames = None
         try:
-            gif = Image.open("mascote.gif")
-            for frame in range(0, getattr(gif, "n_frames", 1)):
-                gif.seek(frame)
-                frame_image = ImageTk.PhotoImage(gif.copy())
-                self.frames.append(frame_image)
+            self.frames = open_frames("mascote.gif")
         except Exception as e:
             print("Erro ao carregar mascote.gif:", e)
-            self.frames = []
+            self.frames = None
 
         self.img_label = tk.Label(root)
         self.img_label.pack()
         self.current_frame = 0
-        if self.frames:
-            self.animate_gif()
+        self.current_photo = None
+        self.anim_scheduler = AnimationScheduler(self.frames) if self.frames else None
+        # Um único PhotoImage persistente; cada troca de quadro copia só as regiões alteradas
+        self.renderer = FrameRenderer(self.frames, root) if self.frames else None
+        self.anim_job = None
+        self.last_wakeup_report = 0.0
 
         # Interface
         self.lbl_intervalo = tk.Label(root, text="Intervalo (segundos):")
         self.lbl_intervalo.pack()
         self.edt_intervalo = tk.Entry(root)
-        self.edt_intervalo.insert(0, "300")
+        self.edt_intervalo.insert(0, str(interval))
         self.edt_intervalo.pack()
         self.lbl_contagem = tk.Label(root, text="Proximo movimento em: 0")
         self.lbl_contagem.pack()
-        self.lbl_ciclos = tk.Label(root, text="Ciclos executados: 0")
+        self.cycle_count = 0
+        self.skipped_count = 0
+        self.lbl_ciclos = tk.Label(root, text="Ciclos executados: 0 | pulados: 0")
         self.lbl_ciclos.pack()
-        self.chk_som_var = tk.BooleanVar()
+        self.lbl_resultado = tk.Label(root, text="Último ciclo: -")
+        self.lbl_resultado.pack()
+        self.lst_tarefas = tk.Listbox(root, height=4, width=50)
+        self.lst_tarefas.pack()
+        self.lbl_tarefa = tk.Label(root, text="Nova tarefa (acao:periodo[:variacao]):")
+        self.lbl_tarefa.pack()
+        self.edt_tarefa = tk.Entry(root)
+        self.edt_tarefa.pack()
+        self.frm_tarefas = tk.Frame(root)
+        self.frm_tarefas.pack()
+        self.btn_adicionar = tk.Button(self.frm_tarefas, text="Adicionar tarefa", command=self.on_add_job)
+        self.btn_adicionar.pack(side=tk.LEFT)
+        self.btn_remover = tk.Button(self.frm_tarefas, text="Remover tarefa", command=self.on_remove_job)
+        self.btn_remover.pack(side=tk.LEFT)
+        self.show_jobs(self.engine.job_summary())
+        self.chk_som_var = tk.BooleanVar(value=sound)
+        self.engine.sound_enabled = sound
         self.chk_som = tk.Checkbutton(root, text="Som", variable=self.chk_som_var, command=self.on_toggle_sound)
         self.chk_som.pack()
         self.btn_desativar = tk.Button(root, text="Ativar", command=self.toggle)
         self.btn_desativar.pack()
+        self.chk_atividade_var = tk.BooleanVar(value=skip_when_active)
+        self.engine.skip_when_active = skip_when_active
+        self.chk_atividade = tk.Checkbutton(root, text="Pular se o usuário estiver ativo",
+                                            variable=self.chk_atividade_var, command=self.on_toggle_activity)
+        self.chk_atividade.pack()
+        self.chk_economia_var = tk.BooleanVar()
+        self.chk_economia = tk.Checkbutton(root, text="Economia de energia", variable=self.chk_economia_var, command=self.on_toggle_low_power)
+        self.chk_economia.pack()
+        self.lbl_despertares = tk.Label(root, text="Despertares/s: 0.0")
+        self.lbl_despertares.pack()
+        self.btn_log = tk.Button(root, text="Ver log", command=self.on_show_log)
+        self.btn_log.pack()
+        self.log_viewer = None
+
+        # Animação pausa enquanto a janela estiver minimizada ou oculta
+        self.root.bind("<Unmap>", self.on_window_unmap)
+        self.root.bind("<Map>", self.on_window_map)
+        if self.frames:
+            self.animate_gif()
 
-        self.timer_thread = None
+        # Canal de controle local (comandos de outras execuções e do mascote_control.py)
+        self.control = control
+        # Comandos recebidos pela thread do canal, executados pelo refresh_ui na thread do Tk
+        self.control_requests = deque()
+        if control is not None:
+            control.dispatch = self.control_dispatch
+            self.schedule_ui_refresh()
 
         # Loga inicialização
         self.log_event("Aplicação iniciada.")
 
-    def log_event(self, mensagem):
-        log_line = f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S} - EVENTO: {mensagem}"
-        with open("cycle_log.txt", "a", encoding="utf-8") as f:
-            f.write(log_line + "\n")
+    def log_event(self, mensagem, kind="evento", **fields):
+        self.engine.log_event(mensagem, kind, **fields)
+
+    def on_close(self):
+        self.running = False
+        if self.profiler is not None:
+            self.profiler.finish_startup()
+        if self.control is not None:
+            self.control.close()
+        self.engine.stop()
+        self.log_event("Aplicação encerrada.")
+        for exporter in self.exporters:
+            exporter.close()
+        self.log_writer.close()
+        if self.event_store is not None:
+            self.event_store.close()
+        self.root.destroy()
 
     def animate_gif(self):
-        if self.frames:
-            self.img_label.config(image=self.frames[self.current_frame])
-            self.current_frame = (self.current_frame + 1) % len(self.frames)
-            self.root.after(100, self.animate_gif)
+        self.anim_job = None
+        if not self.frames or self.anim_scheduler.paused:
+            return
+        now = time.monotonic()
+        index, delay = self.anim_scheduler.tick(now)
+        if index != self.current_frame or self.current_photo is None:
+            photo = self.renderer.show(index)
+            if photo is not self.current_photo:
+                # Primeiro quadro: o rótulo passa a exibir o PhotoImage persistente
+                self.current_photo = photo
+                self.img_label.config(image=photo)
+                if self.profiler is not None:
+                    # A pintura acontece nas tarefas ociosas do Tk; o perfil termina logo depois dela
+                    self.root.after_idle(self.profiler.finish_startup)
+            self.current_frame = index
+            self.root.after_idle(self.frames.prefetch, (index + 1) % self.frames.frame_count)
+        if now - self.last_wakeup_report >= 1:
+            self.last_wakeup_report = now
+            self.lbl_despertares.config(text=f"Despertares/s: {self.anim_scheduler.wakeups_per_second(now):.1f}")
+        self.anim_job = self.root.after(delay, self.animate_gif)
+
+    def on_window_unmap(self, event):
+        # O evento também chega dos widgets filhos; só interessa a janela principal
+        if event.widget is not self.root or not self.anim_scheduler:
+            return
+        self.anim_scheduler.pause()
+        if self.anim_job is not None:
+            self.root.after_cancel(self.anim_job)
+            self.anim_job = None
+        self.lbl_despertares.config(text="Despertares/s: 0.0 (pausado)")
+
+    def on_window_map(self, event):
+        if event.widget is not self.root or not self.anim_scheduler:
+            return
+        if self.anim_scheduler.paused:
+            self.anim_scheduler.resume()
+            self.animate_gif()
+
+    def on_toggle_low_power(self):
+        if self.anim_scheduler:
+            self.anim_scheduler.low_power = self.chk_economia_var.get()
+        if self.chk_economia_var.get():
+            self.log_event("Modo economia de energia ativado pelo usuário.")
+        else:
+            self.log_event("Modo economia de energia desativado pelo usuário.")
 
     def toggle(self):
         if self.running:
             self.running = False
+            self.engine.stop()
             self.btn_desativar.config(text="Ativar")
             self.log_event("Ciclo desativado pelo usuário.")
+            self.schedule_ui_refresh()
         else:
             try:
                 self.interval = int(self.edt_intervalo.get())
@@ -105,232 +269,289 @@ class MascoteApp:
                 self.interval = 5
             if self.interval < 1:
                 self.interval = 5
-            self.remaining = self.interval
-            self.cycle_count = 0
-            self.lbl_ciclos.config(text="Ciclos executados: 0")
             self.running = True
             self.btn_desativar.config(text="Desativar")
             self.log_event(f"Ciclo ativado pelo usuário. Intervalo: {self.interval} segundos.")
             self.start_timer()
 
     def on_toggle_sound(self):
-        if self.chk_som_var.get():
+        # Cópia simples do checkbox: a thread de ciclos não pode ler variáveis do Tk
+        self.engine.sound_enabled = self.chk_som_var.get()
+        if self.engine.sound_enabled:
             self.log_event("Som ativado pelo usuário.")
         else:
             self.log_event("Som desativado pelo usuário.")
 
-    def start_timer(self):
-        def run():
-            while self.running:
-                self.lbl_contagem.config(text=f"Proximo movimento em: {self.remaining}")
-                if self.remaining <= 0:
-                    # Executa sequência de atividades para manter sistema ativo
-                    # Cada função tem seu próprio tratamento de erro
-                    success_count = 0
-                    
-                    # Movimento do mouse (essencial)
-                    try:
-                        # Ocasionalmente faz múltiplos movimentos (10% das vezes)
-                        if random.random() < 0.1:
-                            self.log_event("Executando sequência de múltiplos movimentos...")
-                            movements = random.randint(2, 4)
-                            for i in range(movements):
-                                self.move_mouse()
-                                time.sleep(random.uniform(0.2, 0.8))
-                            self.log_event(f"Sequência de {movements} movimentos concluída.")
-                        else:
-                            self.move_mouse()
-                        success_count += 1
-                    except Exception as e:
-                        self.log_event(f"Falha no movimento do mouse: {e}")
-                    
-                    # Pressionar tecla (essencial)
-                    try:
-                        self.press_key()
-                        success_count += 1
-                    except Exception as e:
-                        self.log_event(f"Falha ao pressionar tecla: {e}")
-                    
-                    # Clique no Teams (opcional - não deve afetar simulação)
-                    try:
-                        self.click_on_teams_icon()
-                    except Exception as e:
-                        self.log_event(f"Clique no Teams falhou (normal se não estiver aberto): {e}")
-                    
-                    # Manter Teams ativo (opcional - não deve afetar simulação)
-                    try:
-                        self.keep_teams_active()
-                    except Exception as e:
-                        self.log_event(f"Ativação do Teams falhou (normal se não estiver aberto): {e}")
-                    
-                    # Som opcional
-                    if self.chk_som_var.get():
-                        try:
-                            self.root.bell()
-                        except:
-                            pass  # Som é opcional
-                    
-                    self.cycle_count += 1
-                    self.lbl_ciclos.config(text=f"Ciclos executados: {self.cycle_count}")
-                    self.log_cycle_count()
-                    
-                    # Log do resultado do ciclo
-                    if success_count >= 2:
-                        self.log_event(f"Ciclo automático #{self.cycle_count} executado com sucesso ({success_count}/2 operações essenciais).")
-                    else:
-                        self.log_event(f"Ciclo automático #{self.cycle_count} executado com falhas ({success_count}/2 operações essenciais).")
-                    
-                    self.remaining = self.interval
-                else:
-                    self.remaining -= 1
-                time.sleep(1)
-        self.timer_thread = threading.Thread(target=run, daemon=True)
-        self.timer_thread.start()
-
-    def move_mouse(self):
+    def on_add_job(self):
         try:
-            # Obtém posição atual e dimensões da tela
-            current_x, current_y = pyautogui.position()
-            screen_width, screen_height = pyautogui.size()
-            
-            # Escolhe aleatoriamente o tipo de movimento
-            movement_type = random.choice([
-                "micro_movement",     # Movimento muito pequeno
-                "small_movement",     # Movimento pequeno
-                "medium_movement",    # Movimento médio
-                "circular_movement",  # Movimento circular
-                "random_corner"       # Movimento para área aleatória da tela
-            ])
-            
-            if movement_type == "micro_movement":
-                # Movimento microscópico (1-5 pixels)
-                move_x = random.randint(-5, 5)
-                move_y = random.randint(-5, 5)
-                new_x = max(10, min(screen_width - 10, current_x + move_x))
-                new_y = max(10, min(screen_height - 10, current_y + move_y))
-                duration = random.uniform(0.1, 0.3)
-                
-            elif movement_type == "small_movement":
-                # Movimento pequeno (10-30 pixels)
-                move_x = random.randint(-30, 30)
-                move_y = random.randint(-30, 30)
-                new_x = max(10, min(screen_width - 10, current_x + move_x))
-                new_y = max(10, min(screen_height - 10, current_y + move_y))
-                duration = random.uniform(0.3, 0.7)
-                
-            elif movement_type == "medium_movement":
-                # Movimento médio (50-100 pixels)
-                move_x = random.randint(-100, 100)
-                move_y = random.randint(-100, 100)
-                new_x = max(50, min(screen_width - 50, current_x + move_x))
-                new_y = max(50, min(screen_height - 50, current_y + move_y))
-                duration = random.uniform(0.5, 1.0)
-                
-            elif movement_type == "circular_movement":
-                # Movimento em pequeno círculo
-                angle = random.uniform(0, 2 * 3.14159)  # Ângulo aleatório
-                radius = random.randint(15, 40)  # Raio do círculo
-                move_x = int(radius * random.uniform(0.5, 1.0) * (1 if random.random() > 0.5 else -1))
-                move_y = int(radius * random.uniform(0.5, 1.0) * (1 if random.random() > 0.5 else -1))
-                new_x = max(50, min(screen_width - 50, current_x + move_x))
-                new_y = max(50, min(screen_height - 50, current_y + move_y))
-                duration = random.uniform(0.8, 1.2)
-                
-            else:  # random_corner
-                # Movimento para área aleatória da tela (mais natural)
-                margin = 100
-                new_x = random.randint(margin, screen_width - margin)
-                new_y = random.randint(margin, screen_height - margin)
-                duration = random.uniform(1.0, 2.0)
-            
-            # Adiciona pequena variação na duração
-            duration *= random.uniform(0.8, 1.2)
-            
-            # Move o mouse com траектória mais natural
-            if movement_type == "circular_movement":
-                # Para movimento circular, faz curva suave
-                mid_x = (current_x + new_x) // 2 + random.randint(-20, 20)
-                mid_y = (current_y + new_y) // 2 + random.randint(-20, 20)
-                pyautogui.moveTo(mid_x, mid_y, duration=duration/2)
-                pyautogui.moveTo(new_x, new_y, duration=duration/2)
-            else:
-                # Movimento direto com velocidade variável
-                pyautogui.moveTo(new_x, new_y, duration=duration)
-            
-            # Log com tipo de movimento
-            distance = ((new_x - current_x)**2 + (new_y - current_y)**2)**0.5
-            self.log_event(f"Mouse movido ({movement_type}): ({current_x},{current_y}) → ({new_x},{new_y}) | Distância: {distance:.1f}px | Duração: {duration:.2f}s")
-            
-        except Exception as e:
-            self.log_event(f"Erro ao mover mouse: {e}")
+            job = self.engine.add_job(self.edt_tarefa.get())
+        except ValueError as e:
+            self.lbl_tarefa.config(text=str(e))
+            self.root.bell()
+            return
+        self.lbl_tarefa.config(text="Nova tarefa (acao:periodo[:variacao]):")
+        self.edt_tarefa.delete(0, tk.END)
+        self.schedule_ui_refresh()
 
-    def press_key(self):
-        # Pressiona barra de espaço para simular atividade
-        try:
-            pyautogui.press('space')
-            self.log_event("Tecla espaço pressionada.")
-        except Exception as e:
-            self.log_event(f"Erro ao pressionar tecla: {e}")
+    def on_remove_job(self):
+        selection = self.lst_tarefas.curselection()
+        if not selection:
+            return
+        self.engine.remove_job(self.job_names[selection[0]])
+        self.schedule_ui_refresh()
 
-    def click_on_teams_icon(self):
-        # Ajuste a posição conforme necessário para o seu Teams
-        try:
-            # Verifica se a posição está dentro da tela
-            screen_width, screen_height = pyautogui.size()
-            if 50 < screen_width and 1050 < screen_height:
-                # Salva posição atual do mouse
-                original_x, original_y = pyautogui.position()
-                
-                # Tenta clicar no Teams
-                pyautogui.moveTo(50, 1050, duration=0.3)
-                pyautogui.click()
-                
-                # Retorna mouse para posição original
-                pyautogui.moveTo(original_x, original_y, duration=0.2)
-                
-                self.log_event("Tentativa de clique no ícone do Teams executada.")
-            else:
-                self.log_event("Posição do Teams fora da tela. Clique ignorado, continuando simulação.")
-        except Exception as e:
-            # Falha no clique do Teams não deve afetar a simulação
-            self.log_event(f"Teams não acessível (isso é normal se não estiver aberto): {e}")
-            self.log_event("Simulação continua normalmente sem o Teams.")
+    def show_jobs(self, summary):
+        self.job_names = [job[0] for job in summary]
+        self.lst_tarefas.delete(0, tk.END)
+        for job in summary:
+            self.lst_tarefas.insert(tk.END, format_job(job))
 
-    def keep_teams_active(self):
-        # Múltiplas estratégias para manter o Teams ativo
-        try:
-            # Pressiona Shift (tecla silenciosa que mantém atividade)
-            pyautogui.press('shift')
-            self.log_event("Tecla Shift pressionada para manter atividade do sistema.")
-            
-            # Simula pequeno movimento do mouse (adicional)
-            current_x, current_y = pyautogui.position()
-            pyautogui.moveTo(current_x + 1, current_y)
-            pyautogui.moveTo(current_x, current_y)
-            
-        except Exception as e:
-            # Falha na ativação do Teams não deve parar a simulação
-            self.log_event(f"Erro ao manter Teams ativo (continuando simulação): {e}")
-            # Tenta uma estratégia alternativa simples
+    def on_show_log(self):
+        # Visualizador carregado só quando pedido; lê apenas o fim do arquivo
+        from mascote_logview import LogViewer
+        if self.log_viewer is not None and self.log_viewer.exists():
+            self.log_viewer.lift()
+            return
+        # Grava as linhas pendentes para que o visualizador já mostre a atividade recente
+        self.log_writer.flush(0.5)
+        self.log_viewer = LogViewer(self.root, self.log_writer.path)
+
+    def on_toggle_activity(self):
+        self.engine.skip_when_active = self.chk_atividade_var.get()
+        if self.engine.skip_when_active:
+            self.log_event("Detecção de atividade do usuário ativada.")
+        else:
+            self.log_event("Detecção de atividade do usuário desativada.")
+
+    def control_dispatch(self, command, value):
+        # Chamado na thread do canal: não toca no Tk, só enfileira o comando para o refresh_ui
+        done = threading.Event()
+        reply = {}
+        self.control_requests.append((command, value, reply, done))
+        if not done.wait(CONTROL_TIMEOUT):
+            return {"ok": False, "mensagem": "A interface não respondeu."}
+        return reply
+
+    def run_control_requests(self):
+        # Thread do Tk: executa os comandos enfileirados pelo canal de controle
+        while True:
+            try:
+                command, value, reply, done = self.control_requests.popleft()
+            except IndexError:
+                return
             try:
-                pyautogui.press('ctrl')
-                self.log_event("Estratégia alternativa: Ctrl pressionado para manter atividade.")
-            except:
-                self.log_event("Todas as estratégias de ativação falharam, mas simulação continua.")
+                reply.update(self.handle_command(command, value))
+            except Exception as e:
+                reply.update(ok=False, mensagem=f"Erro ao executar {command}: {e}")
+            finally:
+                done.set()
 
-    def log_cycle_count(self):
-        log_line = f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S} - Total de ciclos: {self.cycle_count}"
-        with open("cycle_log.txt", "a", encoding="utf-8") as f:
-            f.write(log_line + "\n")
+    def handle_command(self, command, value):
+        message = None
+        if command == "ativar":
+            if not self.running:
+                self.toggle()
+            message = "Ciclos ativados."
+        elif command == "desativar":
+            if self.running:
+                self.toggle()
+            message = "Ciclos desativados."
+        elif command == "intervalo":
+            interval = int(value)
+            if interval < 1:
+                return {"ok": False, "mensagem": f"Intervalo inválido: {value}"}
+            self.edt_intervalo.delete(0, tk.END)
+            self.edt_intervalo.insert(0, str(interval))
+            self.interval = interval
+            self.engine.set_interval(interval)
+            self.log_event(f"Intervalo alterado pelo canal de controle: {interval} segundos.")
+            if self.running:
+                self.schedule_ui_refresh()
+            message = f"Intervalo alterado para {interval} segundos."
+        elif command == "mostrar":
+            self.root.deiconify()
+            self.root.lift()
+            message = "MascoteApp já está em execução."
+        elif command == "encerrar":
+            # Encerra depois de responder
+            self.root.after_idle(self.on_close)
+            message = "Encerrando MascoteApp."
+        return {"ok": True, "mensagem": message, "status": self.engine.status()}
+
+    def start_timer(self):
+        self.engine.start(self.interval)
+        self.schedule_ui_refresh()
+
+    def schedule_ui_refresh(self):
+        if self.ui_job is not None:
+            self.root.after_cancel(self.ui_job)
+        self.refresh_ui()
+
+    def refresh_ui(self):
+        # Único ponto em que o estado dos ciclos e os comandos do canal chegam aos widgets (thread do Tk)
+        self.ui_job = None
+        self.run_control_requests()
+        for key, value in self.state.drain().items():
+            if key in ("cycle_count", "skipped_count"):
+                setattr(self, key, value)
+                self.lbl_ciclos.config(text=f"Ciclos executados: {self.cycle_count} | pulados: {self.skipped_count}")
+            elif key == "last_result":
+                self.lbl_resultado.config(text=f"Último ciclo: {value}")
+            elif key == "jobs":
+                self.show_jobs(value)
+            elif key == "bell":
+                self.root.bell()
+
+        # Contagem derivada do prazo do agendador; o label só é tocado quando o texto muda
+        remaining = self.engine.scheduler.remaining()
+        text = f"Proximo movimento em: {0 if remaining is None else math.ceil(remaining)}"
+        if text != self.countdown_text:
+            self.countdown_text = text
+            self.lbl_contagem.config(text=text)
+
+        if remaining is None and not self.state.pending():
+            if self.control is None:
+                return  # Ciclos parados e nada pendente: não acorda mais
+            delay = CONTROL_POLL_MS  # Só o canal de controle a atender
+        else:
+            delay = UI_REFRESH_MS
+        if remaining is not None:
+            # Acorda no máximo na próxima troca de segundo inteiro da contagem
+            delay = min(delay, int((remaining - math.floor(remaining)) * 1000) + 1)
+        if self.ui_job is not None:
+            # Um comando do canal (ex.: ativar) já reagendou a atualização
+            self.root.after_cancel(self.ui_job)
+        self.ui_job = self.root.after(delay, self.refresh_ui)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="MascoteApp - Mantenha-se ativo no Teams")
+    parser.add_argument("--headless", action="store_true",
+                        help="Executa só os ciclos, sem janela (não carrega tkinter nem PIL)")
+    parser.add_argument("--config", metavar="ARQUIVO",
+                        help="Arquivo .ini com as opções do modo --headless (seção [mascote])")
+    parser.add_argument("--intervalo", type=int, metavar="SEGUNDOS",
+                        help=f"Intervalo entre ciclos (padrão: {DEFAULT_INTERVAL})")
+    parser.add_argument("--som", action="store_true", default=None,
+                        help="Emite som a cada ciclo")
+    parser.add_argument("--log", metavar="ARQUIVO", help="Arquivo de log (padrão: cycle_log.txt)")
+    parser.add_argument("--tarefa", action="append", metavar="ESPEC",
+                        help='Tarefa periódica "[nome=]acao:periodo[:variacao]" (ex.: tecla:60:5); '
+                             'pode ser repetida. Sem tarefas, executa o ciclo completo a cada intervalo')
+    parser.add_argument("--pontos-por-segundo", type=int, metavar="N",
+                        help="Máximo de pontos por segundo nos movimentos do mouse (padrão: 20)")
+    parser.add_argument("--sem-deteccao-atividade", action="store_true", default=None,
+                        help="Executa os ciclos mesmo com o usuário usando a máquina")
+    parser.add_argument("--eventos-db", metavar="ARQUIVO",
+                        help="Grava também os eventos tipados em um banco SQLite (consulte com mascote_events.py)")
+    parser.add_argument("--entrada", choices=sorted(BACKENDS),
+                        help="Backend de entrada: pyautogui (padrão) ou nula (não move mouse nem teclado)")
+    parser.add_argument("--metricas-porta", type=int, metavar="PORTA",
+                        help="Expõe as métricas dos ciclos em http://127.0.0.1:PORTA/metrics (formato Prometheus)")
+    parser.add_argument("--status-arquivo", metavar="ARQUIVO",
+                        help="Reescreve periodicamente um arquivo JSON com as métricas dos ciclos")
+    parser.add_argument("--comando", choices=COMMANDS,
+                        help="Envia um comando à instância em execução e termina "
+                             "(intervalo usa o valor de --intervalo)")
+    parser.add_argument("--perfil", "--profile", nargs="?", const="perfil", metavar="DIR",
+                        help="Grava perfis do início (importações e até o primeiro quadro) e "
+                             "das primeiras execuções agendadas em DIR (padrão: perfil)")
+    parser.add_argument("--perfil-ciclos", type=int, metavar="N",
+                        help="Execuções agendadas perfiladas com --perfil (padrão: 3)")
+    parser.add_argument("--medir-inicio", action="store_true",
+                        help="Abre a janela, desenha o primeiro quadro e sai (medição do tempo de início)")
+    return parser.parse_args(argv)
+
+
+def forward_to_running_instance(args):
+    """Encaminha o comando a uma instância em execução; retorna o código de saída ou None se não houver"""
+    command = args.comando or "mostrar"
+    value = args.intervalo if command == "intervalo" else None
+    if command == "intervalo" and value is None:
+        print("Informe o novo intervalo com --intervalo.")
+        return 2
+    reply = send_command(command, value)
+    if reply is None:
+        if args.comando:
+            print("Nenhuma instância do MascoteApp em execução.")
+            return 1
+        return None
+    print(format_reply(reply))
+    return 0 if reply.get("ok") else 2
+
+
+def create_profiler(args):
+    """SessionProfiler de --perfil (None sem a opção); inicia o perfil do início"""
+    if not args.perfil:
+        return None
+    import mascote_profile
+    profiler = mascote_profile.SessionProfiler(
+        args.perfil,
+        mascote_profile.DEFAULT_CYCLES if args.perfil_ciclos is None else args.perfil_ciclos,
+        mascote_profile.IMPORT_TIMER)
+    profiler.start_startup()
+    return profiler
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        jobs = [parse_job_spec(spec) for spec in args.tarefa] if args.tarefa else None
+    except ValueError as e:
+        print(e)
+        return 2
+
+    # Instância única: se já houver uma em execução, só encaminha o comando e termina
+    control = None
+    if not args.medir_inicio:
+        exit_code = forward_to_running_instance(args)
+        if exit_code is not None:
+            return exit_code
+        try:
+            control = ControlServer()
+        except InstanceRunning:
+            # Outra instância abriu o canal entre a verificação e agora
+            exit_code = forward_to_running_instance(args)
+            return 1 if exit_code is None else exit_code
+        except ControlUnavailable as e:
+            # Diretório do canal criado por outro usuário: roda sem canal de controle
+            print(e)
+
+    # Só o processo que executa o aplicativo é perfilado (uma execução que só encaminha
+    # um comando terminaria com perfis vazios); as importações já foram medidas desde o início
+    profiler = create_profiler(args)
+    if args.headless:
+        from mascote_headless import run_headless
+        return run_headless(args, control, profiler)
+    interval = args.intervalo
+    if interval is None and jobs:
+        # O campo de intervalo controla a tarefa do ciclo completo, se houver
+        interval = next((max(1, round(job.period)) for job in jobs if job.name == CYCLE_JOB), None)
 
-if __name__ == "__main__":
     # Constantes de layout para facilitar futuros ajustes
     WINDOW_WIDTH = 400
-    WINDOW_HEIGHT = 520
+    WINDOW_HEIGHT = 720
 
+    load_gui_modules()
     root = tk.Tk()
     root.iconbitmap("mascote.ico")
     root.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")  # Tamanho fixo da janela
     root.resizable(False, False)  # Impede redimensionamento
-    app = MascoteApp(root)
+    app = MascoteApp(root, event_db=args.eventos_db,
+                     input_backend=create_backend(args.entrada or "pyautogui"),
+                     interval=interval or DEFAULT_INTERVAL, sound=bool(args.som),
+                     log_path=args.log or "cycle_log.txt", metrics_port=args.metricas_porta,
+                     status_path=args.status_arquivo, jobs=jobs,
+                     points_per_second=args.pontos_por_segundo, control=control,
+                     skip_when_active=not args.sem_deteccao_atividade, profiler=profiler)
+    root.protocol("WM_DELETE_WINDOW", app.on_close)
+    if args.medir_inicio:
+        root.update()  # Processa a primeira pintura da janela
+        app.on_close()
+        return 0
     root.mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Detecção de atividade real do usuário
+
+Antes de cada execução agendada, o monitor compara a posição do ponteiro e o
+tempo ocioso do sistema com a última marca (feita ao ativar e após cada
+execução). Se o ponteiro saiu de onde os ciclos o deixaram, ou se houve entrada
+depois da marca, o usuário está usando a máquina: a execução é adiada para o
+próximo prazo e nada é injetado.
+
+A amostragem é feita só no momento da execução (uma leitura do ponteiro e uma
+do tempo ocioso), sem thread nem laço de verificação.
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import time
+
+# Folga na comparação com o tempo ocioso (s): a própria entrada injetada e a
+# resolução do relógio do sistema não devem contar como atividade do usuário
+IDLE_TOLERANCE = 1.0
+
+
+class ActivityMonitor:
+    def __init__(self, input_backend, clock=time.monotonic, tolerance=IDLE_TOLERANCE):
+        self.input = input_backend
+        self.clock = clock
+        self.tolerance = tolerance
+        self._position = None
+        self._marked = None
+
+    def _position_now(self):
+        try:
+            return tuple(self.input.position())
+        except Exception:
+            return None
+
+    def mark(self):
+        """Registra o estado após a última entrada injetada (ou ao ativar)"""
+        self._position = self._position_now()
+        self._marked = self.clock()
+
+    def user_activity(self):
+        """Motivo da atividade detectada desde a última marca ("ponteiro", "entrada") ou None"""
+        if self._marked is None:
+            return None
+        position = self._position_now()
+        if position is not None and self._position is not None and position != self._position:
+            return "ponteiro"
+        try:
+            idle = self.input.idle_seconds()
+        except Exception:
+            idle = None
+        if idle is not None and idle + self.tolerance < self.clock() - self._marked:
+            return "entrada"
+        return None
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Benchmarks do MascoteApp
+
+Mede, em uma máquina Linux sem tela (tkinter e ImageTk substituídos por
+simulações leves, entrada pelo backend nulo):
+- startup: tempo do início do processo até o primeiro quadro exibido, sem e com
+  o cache de quadros em disco;
+- memoria: pico de RSS dos quadros de mascote.gif (lista completa como na versão
+  original, provedor sob demanda e cache mapeado);
+- ciclo: tempo de parede do corpo do ciclo, separado por ação;
+- log: vazão do log_event em linhas por segundo.
+
+Os resultados são gravados em JSON. Com --comparar, cada métrica é comparada a
+um resultado salvo e o script termina com código 1 se alguma piorar além da
+tolerância.
+
+Uso:
+    python mascote_bench.py --saida baseline.json
+    python mascote_bench.py --saida atual.json --comparar baseline.json --tolerancia 0.15
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import time
+
+# Marca o início do processo filho antes de qualquer import pesado
+PROCESS_START = time.perf_counter()
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import types
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GIF_PATH = os.path.join(SCRIPT_DIR, "mascote.gif")
+
+# Métricas comparadas e se valores maiores são melhores
+METRICS = {
+    "startup.sem_cache_ms": False,
+    "startup.com_cache_ms": False,
+    "memoria.lista_completa_kb": False,
+    "memoria.provedor_kb": False,
+    "memoria.mapeado_kb": False,
+    "ciclo.media_ms": False,
+    "ciclo.p95_ms": False,
+    "log.linhas_por_s": True,
+}
+
+
+def install_gui_stubs():
+    """Substitui tkinter e PIL.ImageTk por simulações que não precisam de tela"""
+    from PIL import Image
+    events = {"first_frame": None}
+
+    class Widget:
+        def __init__(self, master=None, **options):
+            self.options = dict(options)
+
+        def pack(self, **options):
+            pass
+
+        def config(self, **options):
+            if "image" in options and events["first_frame"] is None:
+                events["first_frame"] = time.perf_counter()
+            self.options.update(options)
+
+        configure = config
+
+        def insert(self, index, text):
+            self.options["text"] = text
+
+        def get(self):
+            return self.options.get("text", "")
+
+        def delete(self, first, last=None):
+            pass
+
+        def curselection(self):
+            return ()
+
+    class Tk(Widget):
+        tk = None  # Interpretador: o FrameRenderer só o usa para copiar regiões após o primeiro quadro
+
+        def title(self, text):
+            pass
+
+        def bind(self, sequence, callback):
+            pass
+
+        def after(self, delay, callback, *args):
+            # Sem mainloop: callbacks agendados não são executados
+            return "after#"
+
+        def after_idle(self, callback, *args):
+            return "after#"
+
+        def after_cancel(self, job):
+            pass
+
+        def bell(self):
+            pass
+
+        def destroy(self):
+            pass
+
+    class BooleanVar:
+        def __init__(self, master=None, value=False):
+            self._value = value
+
+        def get(self):
+            return self._value
+
+        def set(self, value):
+            self._value = value
+
+    class PhotoImage:
+        def __init__(self, image=None, size=None):
+            # O Tk guarda cada foto em 32 bits por pixel; a cópia simula esse custo
+            if isinstance(image, str):
+                image = Image.new(image, size)  # PhotoImage(modo, tamanho), como no ImageTk
+            self._data = image.convert("RGBA").tobytes()
+
+        def paste(self, image):
+            self._data = image.convert("RGBA").tobytes()
+
+    tkinter = types.ModuleType("tkinter")
+    tkinter.Tk = Tk
+    tkinter.Label = tkinter.Entry = tkinter.Checkbutton = tkinter.Button = Widget
+    tkinter.Listbox = tkinter.Frame = Widget
+    tkinter.END = "end"
+    tkinter.LEFT = "left"
+    tkinter.BooleanVar = BooleanVar
+    sys.modules["tkinter"] = tkinter
+
+    import PIL
+    imagetk = types.ModuleType("PIL.ImageTk")
+    imagetk.PhotoImage = PhotoImage
+    sys.modules["PIL.ImageTk"] = imagetk
+    PIL.ImageTk = imagetk
+    return events
+
+
+def peak_rss_kb():
+    """Pico de RSS deste processo (KB)
+
+    No Linux vem do VmHWM, que é do espaço de memória atual: o ru_maxrss de um
+    filho já começa com o RSS que o pai tinha no fork e esconderia o pico do filho.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def reset_peak_rss():
+    # Linux: o pico volta ao RSS atual, então as importações não entram na medida
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def child_startup():
+    """Processo filho: inicia o MascoteApp e informa o tempo até o primeiro quadro"""
+    events = install_gui_stubs()
+    sys.path.insert(0, SCRIPT_DIR)
+    import mascote
+    from mascote_input import NullBackend
+    mascote.load_gui_modules()
+    root = mascote.tk.Tk()
+    app = mascote.MascoteApp(root, input_backend=NullBackend(), log_path="bench_log.txt")
+    first_frame = events["first_frame"]
+    app.log_writer.close()
+    return {"primeiro_quadro_ms": None if first_frame is None else (first_frame - PROCESS_START) * 1000}
+
+
+def child_memory(mode):
+    """Processo filho: pico de RSS ao percorrer todos os quadros em um dos modos"""
+    install_gui_stubs()
+    sys.path.insert(0, SCRIPT_DIR)
+    from PIL import Image, ImageTk
+    import mascote_frames
+    reset_peak_rss()
+    before = peak_rss_kb()
+    if mode == "lista_completa":
+        # Comportamento original: todos os quadros convertidos e mantidos em memória
+        gif = Image.open("mascote.gif")
+        frames = []
+        for index in range(getattr(gif, "n_frames", 1)):
+            gif.seek(index)
+            frames.append(ImageTk.PhotoImage(gif.copy()))
+    else:
+        if mode == "mapeado":
+            # O cache é gerado pelo processo pai para não entrar no pico medido
+            provider = mascote_frames.MappedFrameProvider(mascote_frames.cache_path_for("mascote.gif"))
+        else:
+            provider = mascote_frames.GifFrameProvider("mascote.gif")
+        # Duas voltas completas na animação, como a janela faria
+        for index in list(range(provider.frame_count)) * 2:
+            frame, _ = provider.get(index)
+            photo = ImageTk.PhotoImage(frame)
+            provider.prefetch((index + 1) % provider.frame_count)
+    return {"pico_kb": peak_rss_kb() - before}
+
+
+def run_child(workdir, *args):
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--filho", *args],
+                            cwd=workdir, check=True, capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def ensure_frame_cache(workdir, present):
+    """Gera ou remove o cache de quadros no diretório de trabalho"""
+    cache = os.path.join(workdir, "mascote.frames")
+    if present and not os.path.exists(cache):
+        sys.path.insert(0, SCRIPT_DIR)
+        from mascote_frames import build_frame_cache
+        build_frame_cache(os.path.join(workdir, "mascote.gif"), cache)
+    elif not present and os.path.exists(cache):
+        os.remove(cache)
+
+
+def bench_startup(workdir, repeat):
+    results = {}
+    for label, with_cache in (("sem_cache_ms", False), ("com_cache_ms", True)):
+        samples = []
+        for _ in range(repeat):
+            ensure_frame_cache(workdir, with_cache)
+            samples.append(run_child(workdir, "startup")["primeiro_quadro_ms"])
+        results[label] = statistics.median(samples)
+    return results
+
+
+def bench_memory(workdir):
+    ensure_frame_cache(workdir, True)
+    return {f"{mode}_kb": run_child(workdir, "memoria", mode)["pico_kb"]
+            for mode in ("lista_completa", "provedor", "mapeado")}
+
+
+class ActionRecorder:
+    """Recebe os eventos do motor (mesma interface do EventStore) e guarda as durações"""
+
+    def __init__(self):
+        self.actions = {}
+        self.cycles = []
+        self.configured = []
+
+    def record(self, kind, message=None, **fields):
+        if kind == "acao":
+            self.actions.setdefault(fields["action"], []).append(fields["duration"])
+        elif kind == "ciclo":
+            self.cycles.append(fields["duration"])
+        elif kind == "movimento":
+            self.configured.append(fields["duration"])
+
+
+def bench_cycle(workdir, cycles):
+    sys.path.insert(0, SCRIPT_DIR)
+    from mascote_engine import CycleEngine
+    from mascote_input import NullBackend
+    from mascote_log import LogWriter
+
+    recorder = ActionRecorder()
+    log_writer = LogWriter(os.path.join(workdir, "ciclo_log.txt"))
+    # Sorteios com semente fixa: os mesmos movimentos em toda execução
+    engine = CycleEngine(NullBackend(), log_writer, event_store=recorder, rng=random.Random(1234))
+    engine.sound_enabled = True
+    for _ in range(cycles):
+        engine.run_cycle()
+    log_writer.close()
+
+    durations = sorted(d * 1000 for d in recorder.cycles)
+    return {
+        "ciclos": len(durations),
+        "media_ms": statistics.mean(durations),
+        "p95_ms": durations[int(len(durations) * 0.95) - 1],
+        "duracao_configurada_media_ms": statistics.mean(recorder.configured) * 1000,
+        "por_acao_media_ms": {name: statistics.mean(values) * 1000
+                              for name, values in sorted(recorder.actions.items())},
+    }
+
+
+def bench_log(workdir, lines):
+    sys.path.insert(0, SCRIPT_DIR)
+    from mascote_engine import CycleEngine
+    from mascote_input import NullBackend
+    from mascote_log import LogWriter
+
+    log_writer = LogWriter(os.path.join(workdir, "vazao_log.txt"))
+    engine = CycleEngine(NullBackend(), log_writer)
+    started = time.perf_counter()
+    for index in range(lines):
+        engine.log_event(f"Linha de teste {index}")
+    enqueued = time.perf_counter()
+    log_writer.close(timeout=None)
+    finished = time.perf_counter()
+    return {
+        "linhas": lines,
+        "linhas_por_s": lines / (finished - started),
+        "enfileiramento_linhas_por_s": lines / (enqueued - started),
+    }
+
+
+def flatten(results):
+    flat = {}
+    for group, values in results.items():
+        for key, value in values.items():
+            if isinstance(value, (int, float)):
+                flat[f"{group}.{key}"] = value
+    return flat
+
+
+def compare(current, baseline, tolerance):
+    """Imprime a variação de cada métrica; retorna a lista de regressões"""
+    current_flat = flatten(current["resultados"])
+    baseline_flat = flatten(baseline["resultados"])
+    regressions = []
+    print(f"{'métrica':32s} {'base':>12s} {'atual':>12s} {'variação':>9s}")
+    for name, higher_is_better in METRICS.items():
+        if name not in current_flat or name not in baseline_flat or not baseline_flat[name]:
+            continue
+        before, after = baseline_flat[name], current_flat[name]
+        change = (after - before) / abs(before)
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSÃO"
+        print(f"{name:32s} {before:12.2f} {after:12.2f} {change * 100:8.1f}%{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do MascoteApp")
+    parser.add_argument("--saida", default="bench_resultado.json", help="Arquivo JSON de resultados")
+    parser.add_argument("--comparar", metavar="BASELINE", help="Compara com um resultado salvo")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="Piora relativa aceita antes de acusar regressão (padrão: 0.10)")
+    parser.add_argument("--repeticoes", type=int, default=7, help="Execuções do teste de startup")
+    parser.add_argument("--ciclos", type=int, default=200, help="Ciclos medidos")
+    parser.add_argument("--linhas", type=int, default=100000, help="Linhas do teste de log")
+    parser.add_argument("--filho", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.filho:
+        if args.filho[0] == "startup":
+            result = child_startup()
+        else:
+            result = child_memory(args.filho[1])
+        print(json.dumps(result))
+        return 0
+
+    workdir = tempfile.mkdtemp(prefix="mascote_bench_")
+    try:
+        shutil.copy2(GIF_PATH, workdir)
+        print("⏱️  Startup...")
+        startup = bench_startup(workdir, args.repeticoes)
+        print("🧠 Memória dos quadros...")
+        memory = bench_memory(workdir)
+        print("🔁 Ciclos...")
+        cycle = bench_cycle(workdir, args.ciclos)
+        print("📝 Log...")
+        log = bench_log(workdir, args.linhas)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "versao": 1,
+        "data": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": {"startup": startup, "memoria": memory, "ciclo": cycle, "log": log},
+    }
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(json.dumps(report["resultados"], indent=2, ensure_ascii=False))
+    print(f"📁 Resultados gravados em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerancia)
+        if regressions:
+            print(f"❌ Regressões: {', '.join(regressions)}")
+            return 1
+        print("✅ Nenhuma regressão acima da tolerância")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
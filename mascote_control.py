@@ -0,0 +1,229 @@
+"""
+Instância única e canal de controle local do MascoteApp
+
+A primeira instância abre um canal local (socket Unix em um diretório privado do
+usuário ou, no Windows, um named pipe) que também serve de trava: uma segunda
+execução encontra o canal, encaminha o comando para a instância em execução e
+termina na hora, sem decodificar o GIF nem disputar o mouse e o log.
+
+O diretório do socket só é usado se pertencer ao usuário e não tiver permissão
+para mais ninguém, e as conexões são autenticadas com uma chave aleatória
+guardada em um arquivo privado do usuário: outro usuário da máquina não
+consegue se passar pelo canal nem enviar comandos. As mensagens são JSON
+({"comando": ..., "valor": ...}); nada é desserializado com pickle.
+
+Uso:
+    python mascote_control.py status
+    python mascote_control.py ativar
+    python mascote_control.py desativar
+    python mascote_control.py intervalo 120
+    python mascote_control.py encerrar
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import argparse
+import getpass
+import json
+import math
+import os
+import stat
+import sys
+import tempfile
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+COMMANDS = ("ativar", "desativar", "intervalo", "status", "mostrar", "encerrar")
+
+# Tempo máximo de espera pela resposta da instância em execução (s)
+DEFAULT_TIMEOUT = 5.0
+
+# Tamanho máximo de uma mensagem (bytes)
+MAX_MESSAGE = 64 * 1024
+
+# Tamanho da chave de autenticação das conexões (bytes)
+AUTHKEY_SIZE = 32
+
+
+class InstanceRunning(Exception):
+    """Já existe uma instância com o canal de controle aberto"""
+
+
+class ControlUnavailable(OSError):
+    """O diretório do canal de controle não é privado do usuário atual"""
+
+
+def private_directory(directory):
+    """Cria o diretório (0700) e confere que ele pertence só ao usuário atual"""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if sys.platform == "win32":
+        return directory  # Perfil do usuário: protegido pelas permissões do Windows
+    # lstat: um link simbólico criado por outro usuário também é recusado
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise ControlUnavailable(
+            f"{directory} não é um diretório privado do usuário (dono {info.st_uid}, "
+            f"permissões {stat.S_IMODE(info.st_mode):o}); canal de controle desativado.")
+    return directory
+
+
+def control_directory():
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return private_directory(os.path.join(base, "mascote"))
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return private_directory(os.path.join(base, f"mascote-{os.getuid()}"))
+
+
+def control_address():
+    """Endereço e família do canal de controle do usuário atual"""
+    if sys.platform == "win32":
+        return rf"\\.\pipe\mascote-{getpass.getuser()}", "AF_PIPE"
+    # Diretório acessível só pelo usuário: outros usuários não conseguem enviar comandos
+    return os.path.join(control_directory(), "controle.sock"), "AF_UNIX"
+
+
+def control_authkey():
+    """Chave das conexões do canal, criada na primeira execução em um arquivo só do usuário"""
+    path = os.path.join(control_directory(), "controle.chave")
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass
+    else:
+        with os.fdopen(fd, "wb") as f:
+            f.write(os.urandom(AUTHKEY_SIZE))
+    with open(path, "rb") as f:
+        key = f.read()
+    if len(key) < AUTHKEY_SIZE:
+        raise ControlUnavailable(f"Chave do canal de controle inválida: {path}")
+    return key
+
+
+def send_command(command, value=None, address=None, timeout=DEFAULT_TIMEOUT, authkey=None):
+    """Envia um comando à instância em execução; retorna a resposta ou None se não houver instância"""
+    try:
+        if address is None:
+            address, family = control_address()
+        else:
+            family = None
+        if authkey is None:
+            authkey = control_authkey()
+        conn = Client(address, family, authkey=authkey)
+    except (OSError, EOFError, AuthenticationError):
+        # Sem instância, sem permissão ou canal de outro usuário: nada é enviado
+        return None
+    with conn:
+        conn.send_bytes(json.dumps({"comando": command, "valor": value}).encode("utf-8"))
+        if not conn.poll(timeout):
+            return {"ok": False, "mensagem": "A instância em execução não respondeu."}
+        return json.loads(conn.recv_bytes(MAX_MESSAGE).decode("utf-8"))
+
+
+def format_reply(reply):
+    lines = [reply.get("mensagem", "")]
+    status = reply.get("status")
+    if status:
+        lines.append(f"Ativo: {'sim' if status['ativo'] else 'não'}")
+        lines.append(f"Intervalo: {status['intervalo']} s")
+        lines.append(f"Ciclos executados: {status['ciclos']} (pulados: {status.get('pulados', 0)})")
+        if status.get("proximo_em") is not None:
+            lines.append(f"Próxima execução em: {math.ceil(status['proximo_em'])} s")
+        if status.get("suspensas"):
+            lines.append(f"Ações suspensas: {', '.join(status['suspensas'])}")
+        for job in status.get("tarefas", []):
+            lines.append(f"  {job}")
+    return "\n".join(line for line in lines if line)
+
+
+class ControlServer:
+    def __init__(self, dispatch=None, address=None, authkey=None):
+        # dispatch(comando, valor) -> dict; chamado na thread do canal
+        # ControlUnavailable se o diretório do canal não for privado do usuário
+        self.dispatch = dispatch
+        if address is None:
+            address, family = control_address()
+        else:
+            family = None
+        self.address = address
+        self.authkey = control_authkey() if authkey is None else authkey
+        if family == "AF_UNIX" and os.path.exists(address):
+            if send_command("status", address=address, authkey=self.authkey) is not None:
+                raise InstanceRunning(address)
+            os.unlink(address)  # Socket de uma instância que terminou sem fechar o canal
+        try:
+            # No Windows o primeiro pipe é criado com FILE_FLAG_FIRST_PIPE_INSTANCE: um segundo falha
+            self._listener = Listener(address, family, authkey=self.authkey)
+        except OSError as e:
+            raise InstanceRunning(address) from e
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="mascote-controle", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        # Uma conexão vazia desbloqueia o accept antes de fechar o canal
+        try:
+            Client(self.address, authkey=self.authkey).close()
+        except (OSError, EOFError, AuthenticationError):
+            pass
+        self._thread.join(1.0)
+        self._listener.close()
+
+    def _run(self):
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                # Inclui conexões que não apresentaram a chave do canal
+                if self._closed:
+                    return
+                continue
+            with conn:
+                if self._closed:
+                    return
+                try:
+                    request = json.loads(conn.recv_bytes(MAX_MESSAGE).decode("utf-8"))
+                    reply = self._handle(request.get("comando"), request.get("valor"))
+                    conn.send_bytes(json.dumps(reply).encode("utf-8"))
+                except (EOFError, OSError, ValueError, AttributeError):
+                    pass  # Cliente desconectou ou enviou uma mensagem inválida
+
+    def _handle(self, command, value):
+        if command not in COMMANDS:
+            return {"ok": False, "mensagem": f"Comando desconhecido: {command}"}
+        if self.dispatch is None:
+            return {"ok": False, "mensagem": "Aplicação ainda inicializando."}
+        try:
+            return self.dispatch(command, value)
+        except Exception as e:
+            return {"ok": False, "mensagem": f"Erro ao executar {command}: {e}"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Controla o MascoteApp em execução")
+    parser.add_argument("comando", choices=COMMANDS)
+    parser.add_argument("valor", nargs="?", type=int, help="Segundos (comando intervalo)")
+    args = parser.parse_args(argv)
+    if args.comando == "intervalo" and args.valor is None:
+        parser.error("informe o intervalo em segundos")
+
+    try:
+        control_address()
+    except ControlUnavailable as e:
+        print(e)
+        return 1
+    reply = send_command(args.comando, args.valor)
+    if reply is None:
+        print("Nenhuma instância do MascoteApp em execução.")
+        return 1
+    print(format_reply(reply))
+    return 0 if reply.get("ok") else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,497 @@
+"""
+Motor de ciclos do MascoteApp
+
+Contém a lógica dos ciclos (mouse, tecla, Teams, som), o registro de eventos e as
+tarefas periódicas do agendador, sem depender de tkinter nem de PIL. É usado tanto pela janela
+(MascoteApp) quanto pelo modo sem interface (--headless).
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import datetime
+import random
+import time
+from mascote_activity import ActivityMonitor
+from mascote_metrics import MetricsRegistry
+from mascote_scheduler import Job, JobScheduler
+from mascote_trajectory import ARC_CURVES, CURVES, DEFAULT_POINTS_PER_SECOND, build_path, replay
+from mascote_watchdog import CircuitBreaker, Watchdog
+
+# Ações do ciclo, na ordem de execução
+ACTIONS = ("mouse", "tecla", "teams_clique", "teams_ativo", "som")
+
+# Ações cuja falha marca o ciclo como "com falhas"
+ESSENTIAL_ACTIONS = ("mouse", "tecla")
+
+# Tarefa que executa o ciclo completo (todas as ações em sequência)
+CYCLE_JOB = "ciclo"
+
+# Período padrão do ciclo completo (s)
+DEFAULT_CYCLE_PERIOD = 300
+
+# Tempo máximo de cada ação (s); acima dele a ação é dada como travada e a thread
+# trabalhadora é substituída. O mouse pode fazer uma sequência de até 4 movimentos.
+ACTION_TIMEOUTS = {"mouse": 30.0, "tecla": 10.0, "teams_clique": 10.0, "teams_ativo": 10.0, "som": 10.0}
+
+
+def format_job(summary):
+    _, description, runs, failures, skips = summary
+    return f"{description} | execuções: {runs}, falhas: {failures}, puladas: {skips}"
+
+
+def parse_job_spec(spec):
+    """Cria uma tarefa a partir de "[nome=]acao:periodo[:variacao]" (ex.: "tecla:60:5")"""
+    name, _, rest = spec.strip().rpartition("=")
+    parts = rest.split(":")
+    if len(parts) not in (2, 3):
+        raise ValueError(f"Tarefa inválida: {spec!r} (use acao:periodo[:variacao])")
+    action = parts[0].strip()
+    if action != CYCLE_JOB and action not in ACTIONS:
+        raise ValueError(f"Ação desconhecida: {action!r} (use {', '.join((CYCLE_JOB,) + ACTIONS)})")
+    try:
+        period = float(parts[1])
+        jitter = float(parts[2]) if len(parts) == 3 else 0.0
+    except ValueError:
+        raise ValueError(f"Tarefa inválida: {spec!r} (período e variação em segundos)") from None
+    return Job(name.strip() or action, action, period, jitter)
+
+
+class CycleEngine:
+    def __init__(self, input_backend, log_writer, event_store=None, state=None, bell=None,
+                 metrics=None, jobs=None, clock=None, rng=None):
+        self.input = input_backend
+        self.log_writer = log_writer
+        self.event_store = event_store
+        # Canal de estado da interface (None no modo sem interface)
+        self.state = state
+        # Emissor de som; sem ele o pedido de som é publicado no canal de estado
+        self.bell = bell
+        if clock is None:
+            self.clock, self.now, sleep = time.monotonic, datetime.datetime.now, None
+        else:
+            # Relógio virtual (mascote_simulation): sem thread no agendador, pausas só avançam o tempo
+            self.clock, self.now, sleep = clock.monotonic, clock.now, clock.sleep
+        # Sorteios dos movimentos, das sequências e das variações das tarefas; com semente, reproduzíveis
+        self.rng = rng or random.Random()
+        self.cycle_count = 0
+        self.skipped_count = 0
+        # Pedidos de som publicados; cada pedido tem valor novo, senão o canal descartaria os repetidos
+        self.bell_count = 0
+        self.sound_enabled = False
+        # Adia as execuções enquanto o usuário estiver usando a máquina
+        self.skip_when_active = True
+        self.activity = ActivityMonitor(input_backend, clock=self.clock)
+        # Limite de pontos por segundo enviados ao sistema durante um movimento do mouse
+        self.points_per_second = DEFAULT_POINTS_PER_SECOND
+        # Vigia de ações travadas (só com a thread do agendador; a simulação não trava)
+        self.watchdog = Watchdog(self.on_action_stalled) if clock is None else None
+        # Disjuntor por ação: suspende por um tempo as ações que falham seguidamente
+        self.breakers = {name: CircuitBreaker(clock=self.clock) for name in ACTIONS}
+        # Perfil das primeiras execuções (mascote_profile.SessionProfiler, só com --perfil)
+        self.profiler = None
+        # Histogramas e contadores por ação (sempre ativos; exportação é opcional)
+        self.metrics = metrics or MetricsRegistry(ACTIONS)
+
+        # Agendador de tarefas: uma única thread, acordada pelo prazo mais próximo ou por mudanças
+        self.scheduler = JobScheduler(self.run_job, clock=self.clock, rng=self.rng,
+                                      threaded=clock is None, sleep=sleep)
+        if jobs is None:
+            jobs = [Job(CYCLE_JOB, CYCLE_JOB, DEFAULT_CYCLE_PERIOD)]
+        for job in jobs:
+            self.scheduler.add(job)
+
+    def start(self, interval=None):
+        # O intervalo informado na interface/linha de comando é o período do ciclo completo
+        if interval is not None:
+            self.scheduler.set_period(CYCLE_JOB, interval)
+        self.cycle_count = 0
+        self.skipped_count = 0
+        self.publish("cycle_count", 0)
+        self.publish("skipped_count", 0)
+        self.activity.mark()
+        self.scheduler.start()
+        self.publish_jobs()
+
+    def stop(self):
+        self.scheduler.stop()
+
+    def add_job(self, job):
+        if isinstance(job, str):
+            job = parse_job_spec(job)
+        self.scheduler.add(job)
+        self.log_event(f"Tarefa adicionada: {job.describe()}.")
+        self.publish_jobs()
+        return job
+
+    def remove_job(self, name):
+        job = self.scheduler.remove(name)
+        if job is not None:
+            self.log_event(f"Tarefa removida: {job.name}.")
+            self.publish_jobs()
+        return job
+
+    def job_summary(self):
+        # Tuplas imutáveis: o canal de estado só repassa à interface o que mudou
+        return tuple((job.name, job.describe(), job.runs, job.failures, job.skips)
+                     for job in self.scheduler.jobs())
+
+    def publish_jobs(self):
+        self.publish("jobs", self.job_summary())
+
+    def set_interval(self, interval):
+        # Novo período do ciclo completo; com os ciclos ativos vale a partir de agora
+        self.scheduler.set_period(CYCLE_JOB, interval)
+
+    def status(self):
+        cycle_job = self.scheduler.get(CYCLE_JOB)
+        remaining = self.scheduler.remaining()
+        return {
+            "ativo": self.scheduler.active,
+            "intervalo": cycle_job.period if cycle_job is not None else None,
+            "ciclos": self.cycle_count,
+            "pulados": self.skipped_count,
+            "suspensas": [name for name, breaker in self.breakers.items() if breaker.is_open],
+            "proximo_em": remaining,
+            "tarefas": [format_job(summary) for summary in self.job_summary()],
+        }
+
+    def publish(self, key, value):
+        if self.state is not None:
+            self.state.publish(key, value)
+
+    def log_event(self, mensagem, kind="evento", **fields):
+        log_line = f"{self.now():%Y-%m-%d %H:%M:%S} - EVENTO: {mensagem}"
+        self.log_writer.write(log_line)
+        self.record_event(kind, mensagem, **fields)
+
+    def record_event(self, kind, message=None, **fields):
+        # Backend SQLite opcional: só grava quando --eventos-db foi informado
+        if self.event_store is not None:
+            self.event_store.record(kind, message, ts=self.now().timestamp(), **fields)
+
+    def run_job(self, job):
+        # Executada pela thread do agendador a cada prazo vencido de uma tarefa
+        if self.skip_when_active:
+            # Uma amostra por execução: ponteiro e tempo ocioso desde a última marca
+            reason = self.activity.user_activity()
+            if reason is not None:
+                self.skip_job(job, reason)
+                return
+        started = self.clock()
+        profiler = self.profiler
+        if profiler is not None:
+            ok = profiler.profile_cycle(job.name, self.execute_job, job)
+            if not profiler.wants_cycles:
+                self.profiler = None
+        else:
+            ok = self.execute_job(job)
+        # Nova marca: a entrada injetada agora não conta como atividade do usuário
+        self.activity.mark()
+        if ok is None:
+            return  # Interrompida: não conta como execução
+        job.record(ok, self.clock() - started)
+        self.publish_jobs()
+
+    def execute_job(self, job):
+        if job.action == CYCLE_JOB:
+            return self.run_cycle()
+        action, failure_message = self.action_table()[job.action]
+        return self.run_action(job.action, action, failure_message)
+
+    def skip_job(self, job, reason):
+        # Nada é injetado; a tarefa volta a ser avaliada no próximo prazo
+        job.record_skip()
+        self.skipped_count += 1
+        self.activity.mark()
+        self.publish("skipped_count", self.skipped_count)
+        self.publish_jobs()
+        origem = "movimento do ponteiro" if reason == "ponteiro" else "entrada recente"
+        self.log_event(
+            f"Tarefa {job.name} adiada: usuário ativo ({origem}). Execuções puladas: {self.skipped_count}.",
+            kind="pulado", action=job.action)
+
+    def action_table(self):
+        return {
+            "mouse": (self.move_mouse_sequence, "Falha no movimento do mouse"),
+            "tecla": (self.press_key, "Falha ao pressionar tecla"),
+            "teams_clique": (self.click_on_teams_icon,
+                             "Clique no Teams falhou (normal se não estiver aberto)"),
+            "teams_ativo": (self.keep_teams_active,
+                            "Ativação do Teams falhou (normal se não estiver aberto)"),
+            "som": (self.ring_bell, "Falha ao emitir som"),
+        }
+
+    def run_cycle(self):
+        # Executa sequência de atividades para manter sistema ativo
+        # Cada ação tem seu próprio tratamento de erro
+        # Retorna True/False conforme as operações essenciais, ou None se interrompido
+        cycle_started = self.clock()
+        success_count = 0
+
+        table = self.action_table()
+        # Movimento do mouse e tecla são essenciais; Teams é opcional e não deve afetar a simulação
+        names = ["mouse", "tecla", "teams_clique", "teams_ativo"]
+        # Som opcional
+        if self.sound_enabled:
+            names.append("som")
+
+        for name in names:
+            # Desativar interrompe o ciclo entre uma ação e outra
+            if self.scheduler.interrupted():
+                self.log_event("Ciclo interrompido pelo usuário.")
+                return None
+            action, failure_message = table[name]
+            ok = self.run_action(name, action, failure_message)
+            if ok is None:
+                return None  # Ação travada: o vigia já registrou e o ciclo foi abandonado
+            if ok and name in ESSENTIAL_ACTIONS:
+                success_count += 1
+
+        self.cycle_count += 1
+        self.publish("cycle_count", self.cycle_count)
+        self.log_cycle_count()
+
+        # Log do resultado do ciclo
+        cycle_duration = self.clock() - cycle_started
+        self.metrics.observe_cycle(cycle_duration, success_count >= 2)
+        resultado = "com sucesso" if success_count >= 2 else "com falhas"
+        self.publish("last_result", f"#{self.cycle_count} {resultado} ({success_count}/2)")
+        self.log_event(
+            f"Ciclo automático #{self.cycle_count} executado {resultado} ({success_count}/2 operações essenciais).",
+            kind="ciclo", cycle=self.cycle_count, success_count=success_count,
+            duration=cycle_duration)
+        return success_count >= 2
+
+    def run_action(self, name, action, failure_message):
+        # Executa uma ação do ciclo registrando duração e resultado
+        # Retorna True/False, ou None se a ação travou e esta thread foi abandonada
+        breaker = self.breakers[name]
+        if not breaker.allow():
+            return False  # Suspensa pelo disjuntor: não gasta tempo do ciclo
+        started = self.clock()
+        token = self.watchdog.begin(name, ACTION_TIMEOUTS[name]) if self.watchdog is not None else None
+        try:
+            # Ações sinalizam falha tratada internamente retornando False
+            ok = action() is not False
+        except Exception as e:
+            ok = False
+            self.log_event(f"{failure_message}: {e}")
+        if token is not None and not self.watchdog.end(token):
+            return None  # O travamento já foi registrado pelo vigia
+        elapsed = self.clock() - started
+        self.metrics.observe(name, elapsed, ok)
+        if self.event_store is not None:
+            # Sem banco de eventos não monta os campos a cada ação
+            self.record_event("acao", action=name, ok=ok, cycle=self.cycle_count + 1, duration=elapsed)
+        self.update_breaker(name, ok)
+        return ok
+
+    def update_breaker(self, name, ok):
+        breaker = self.breakers[name]
+        change = breaker.record(ok)
+        if change == "suspensa":
+            self.log_event(f"Ação {name} suspensa por {breaker.last_backoff:g}s após "
+                           f"{breaker.failures} falhas seguidas.", kind="disjuntor", action=name, ok=False)
+        elif change == "liberada":
+            self.log_event(f"Ação {name} voltou a funcionar; suspensão encerrada.",
+                           kind="disjuntor", action=name, ok=True)
+
+    def on_action_stalled(self, name, elapsed):
+        # Chamado pela thread do vigia: a thread trabalhadora está presa na ação "name"
+        job = self.scheduler.restart_worker()
+        self.metrics.observe(name, elapsed, False)
+        if self.event_store is not None:
+            self.record_event("acao", action=name, ok=False, cycle=self.cycle_count + 1, duration=elapsed)
+        if job is not None:
+            job.record(False, elapsed)
+            self.publish_jobs()
+        self.log_event(f"Ação {name} travada há {elapsed:.1f}s; thread de tarefas reiniciada.",
+                       kind="travamento", action=name, duration=elapsed)
+        # A tela pode ter mudado (sessão bloqueada, troca de monitor)
+        self.input.invalidate()
+        self.update_breaker(name, False)
+
+    def ring_bell(self):
+        if self.bell is not None:
+            self.bell()
+        else:
+            # O som é emitido pela thread do Tk ao drenar o canal de estado
+            self.bell_count += 1
+            self.publish("bell", self.bell_count)
+
+    def move_mouse_sequence(self):
+        # Ocasionalmente faz múltiplos movimentos (10% das vezes)
+        if self.rng.random() < 0.1:
+            self.log_event("Executando sequência de múltiplos movimentos...")
+            movements = self.rng.randint(2, 4)
+            ok = True
+            for i in range(movements):
+                ok = self.move_mouse() and ok
+                # Pausa interrompível: Desativar encerra a sequência imediatamente
+                if not self.pause(self.rng.uniform(0.2, 0.8)):
+                    self.log_event(f"Sequência interrompida após {i + 1} movimentos.")
+                    return ok
+            self.log_event(f"Sequência de {movements} movimentos concluída.")
+            return ok
+        return self.move_mouse()
+
+    def move_mouse(self):
+        try:
+            # Obtém posição atual e dimensões da tela
+            current_x, current_y = self.input.position()
+            screen_width, screen_height = self.input.size()
+            
+            # Escolhe aleatoriamente o tipo de movimento
+            movement_type = self.rng.choice([
+                "micro_movement",     # Movimento muito pequeno
+                "small_movement",     # Movimento pequeno
+                "medium_movement",    # Movimento médio
+                "circular_movement",  # Movimento circular
+                "random_corner"       # Movimento para área aleatória da tela
+            ])
+            
+            if movement_type == "micro_movement":
+                # Movimento microscópico (1-5 pixels)
+                move_x = self.rng.randint(-5, 5)
+                move_y = self.rng.randint(-5, 5)
+                new_x = max(10, min(screen_width - 10, current_x + move_x))
+                new_y = max(10, min(screen_height - 10, current_y + move_y))
+                duration = self.rng.uniform(0.1, 0.3)
+                
+            elif movement_type == "small_movement":
+                # Movimento pequeno (10-30 pixels)
+                move_x = self.rng.randint(-30, 30)
+                move_y = self.rng.randint(-30, 30)
+                new_x = max(10, min(screen_width - 10, current_x + move_x))
+                new_y = max(10, min(screen_height - 10, current_y + move_y))
+                duration = self.rng.uniform(0.3, 0.7)
+                
+            elif movement_type == "medium_movement":
+                # Movimento médio (50-100 pixels)
+                move_x = self.rng.randint(-100, 100)
+                move_y = self.rng.randint(-100, 100)
+                new_x = max(50, min(screen_width - 50, current_x + move_x))
+                new_y = max(50, min(screen_height - 50, current_y + move_y))
+                duration = self.rng.uniform(0.5, 1.0)
+                
+            elif movement_type == "circular_movement":
+                # Movimento em pequeno círculo
+                angle = self.rng.uniform(0, 2 * 3.14159)  # Ângulo aleatório
+                radius = self.rng.randint(15, 40)  # Raio do círculo
+                move_x = int(radius * self.rng.uniform(0.5, 1.0) * (1 if self.rng.random() > 0.5 else -1))
+                move_y = int(radius * self.rng.uniform(0.5, 1.0) * (1 if self.rng.random() > 0.5 else -1))
+                new_x = max(50, min(screen_width - 50, current_x + move_x))
+                new_y = max(50, min(screen_height - 50, current_y + move_y))
+                duration = self.rng.uniform(0.8, 1.2)
+                
+            else:  # random_corner
+                # Movimento para área aleatória da tela (mais natural)
+                margin = 100
+                new_x = self.rng.randint(margin, screen_width - margin)
+                new_y = self.rng.randint(margin, screen_height - margin)
+                duration = self.rng.uniform(1.0, 2.0)
+            
+            # Adiciona pequena variação na duração
+            duration *= self.rng.uniform(0.8, 1.2)
+            
+            # Move o mouse com trajetória mais natural
+            if movement_type == "circular_movement":
+                # Para movimento circular, faz um arco acentuado
+                curve = self.rng.choice(ARC_CURVES)
+            elif movement_type == "micro_movement":
+                curve = 0.0
+            else:
+                # Curva suave com aceleração e desaceleração
+                curve = self.rng.choice(CURVES)
+            self.follow_path((current_x, current_y), (new_x, new_y), duration, curve)
+            
+            # Log com tipo de movimento
+            distance = ((new_x - current_x)**2 + (new_y - current_y)**2)**0.5
+            self.log_event(f"Mouse movido ({movement_type}): ({current_x},{current_y}) → ({new_x},{new_y}) | Distância: {distance:.1f}px | Duração: {duration:.2f}s",
+                           kind="movimento", movement_type=movement_type,
+                           distance=distance, duration=duration, cycle=self.cycle_count + 1)
+            return True
+            
+        except Exception as e:
+            self.log_event(f"Erro ao mover mouse: {e}")
+            self.input.invalidate()  # A tela pode ter mudado de resolução
+            return False
+
+    def follow_path(self, start, end, duration, curve=0.0):
+        # Caminho calculado de uma vez e reproduzido em um único laço de tempo;
+        # a espera é interrompível, então Desativar encerra o movimento
+        path = build_path(start, end, duration, curve, self.points_per_second)
+        self.input.begin_path()
+        replay(path, duration, self.input.move_point, wait=self.pause, clock=self.clock)
+
+    def pause(self, seconds):
+        # Pausa dos movimentos; com o backend nulo (sem relógio virtual) só verifica a interrupção
+        if self.input.real_time or self.scheduler.sleep is not None:
+            return self.scheduler.pause(seconds)
+        return not self.scheduler.interrupted()
+
+    def press_key(self):
+        # Pressiona barra de espaço para simular atividade
+        try:
+            self.input.press('space')
+            self.log_event("Tecla espaço pressionada.")
+            return True
+        except Exception as e:
+            self.log_event(f"Erro ao pressionar tecla: {e}")
+            return False
+
+    def click_on_teams_icon(self):
+        # Ajuste a posição conforme necessário para o seu Teams
+        try:
+            # Verifica se a posição está dentro da tela
+            screen_width, screen_height = self.input.size()
+            if 50 < screen_width and 1050 < screen_height:
+                # Salva posição atual do mouse
+                original_x, original_y = self.input.position()
+                
+                # Tenta clicar no Teams
+                self.input.move_to(50, 1050, duration=0.3)
+                self.input.click()
+                
+                # Retorna mouse para posição original
+                self.input.move_to(original_x, original_y, duration=0.2)
+                
+                self.log_event("Tentativa de clique no ícone do Teams executada.")
+            else:
+                self.log_event("Posição do Teams fora da tela. Clique ignorado, continuando simulação.")
+            return True
+        except Exception as e:
+            # Falha no clique do Teams não deve afetar a simulação
+            self.log_event(f"Teams não acessível (isso é normal se não estiver aberto): {e}")
+            self.log_event("Simulação continua normalmente sem o Teams.")
+            return False
+
+    def keep_teams_active(self):
+        # Múltiplas estratégias para manter o Teams ativo
+        try:
+            # Pressiona Shift (tecla silenciosa que mantém atividade)
+            self.input.press('shift')
+            self.log_event("Tecla Shift pressionada para manter atividade do sistema.")
+            
+            # Simula pequeno movimento do mouse (adicional)
+            current_x, current_y = self.input.position()
+            self.input.move_to(current_x + 1, current_y)
+            self.input.move_to(current_x, current_y)
+            return True
+            
+        except Exception as e:
+            # Falha na ativação do Teams não deve parar a simulação
+            self.log_event(f"Erro ao manter Teams ativo (continuando simulação): {e}")
+            # Tenta uma estratégia alternativa simples
+            try:
+                self.input.press('ctrl')
+                self.log_event("Estratégia alternativa: Ctrl pressionado para manter atividade.")
+                return True
+            except:
+                self.log_event("Todas as estratégias de ativação falharam, mas simulação continua.")
+                return False
+
+    def log_cycle_count(self):
+        log_line = f"{self.now():%Y-%m-%d %H:%M:%S} - Total de ciclos: {self.cycle_count}"
+        self.log_writer.write(log_line)
@@ -0,0 +1,364 @@
+"""
+Armazenamento indexado de eventos dos ciclos (SQLite)
+
+Backend opcional do log_event: cada evento é gravado com campos tipados em um
+banco SQLite em modo WAL, com inserções em lote feitas por uma thread dedicada.
+Índices por data e por tipo permitem consultar o histórico sem varrer o log.
+
+Uso pela linha de comando:
+    python mascote_events.py --db eventos.db ciclos-por-dia
+    python mascote_events.py --db eventos.db falhas-por-acao
+    python mascote_events.py --db eventos.db latencia-media
+    python mascote_events.py --db eventos.db importar cycle_log.txt [cycle_log.txt.1.gz ...]
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import argparse
+import datetime
+import gzip
+import hashlib
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+# Quantidade máxima de eventos por transação
+BATCH_SIZE = 500
+
+# Intervalo máximo entre a chegada de um evento e sua gravação (s)
+FLUSH_INTERVAL = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    cycle INTEGER,
+    action TEXT,
+    ok INTEGER,
+    movement_type TEXT,
+    distance REAL,
+    duration REAL,
+    success_count INTEGER,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS idx_events_kind_ts ON events (kind, ts);
+CREATE INDEX IF NOT EXISTS idx_events_kind_action ON events (kind, action, ok);
+"""
+
+COLUMNS = ("ts", "kind", "cycle", "action", "ok", "movement_type",
+           "distance", "duration", "success_count", "message")
+
+INSERT = f"INSERT INTO events ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+# Sinal de encerramento da thread gravadora
+_STOP = object()
+
+
+def connect(path):
+    """Abre o banco em modo WAL e garante o esquema"""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def make_row(kind, message=None, ts=None, **fields):
+    """Monta a linha da tabela events a partir dos campos do evento"""
+    if "ok" in fields and fields["ok"] is not None:
+        fields["ok"] = int(bool(fields["ok"]))
+    values = dict(fields, ts=time.time() if ts is None else ts, kind=kind, message=message)
+    return tuple(values.get(column) for column in COLUMNS)
+
+
+class EventStore:
+    def __init__(self, path):
+        self.path = path
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        # Conexão aberta aqui para que erros de caminho apareçam para quem cria o store
+        connect(path).close()
+        self._thread = threading.Thread(target=self._run, name="mascote-events", daemon=True)
+        self._thread.start()
+
+    def record(self, kind, message=None, **fields):
+        """Enfileira um evento; a gravação acontece em lote na thread do store"""
+        if not self._closed:
+            self._queue.put(make_row(kind, message, **fields))
+
+    def close(self, timeout=5.0):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        # Conexões SQLite pertencem à thread que as criou
+        conn = connect(self.path)
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            while item is not None:
+                if item is _STOP:
+                    self._insert(conn, batch)
+                    conn.close()
+                    return
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + FLUSH_INTERVAL
+                if len(batch) >= BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            if batch and (len(batch) >= BATCH_SIZE or time.monotonic() >= deadline):
+                self._insert(conn, batch)
+                batch = []
+                deadline = None
+
+    def _insert(self, conn, batch):
+        if not batch:
+            return
+        try:
+            with conn:
+                conn.executemany(INSERT, batch)
+        except sqlite3.Error as e:
+            print("Erro ao gravar eventos:", e)
+
+
+# Linhas do cycle_log.txt
+LINE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - (?:EVENTO: (.*)|Total de ciclos: (\d+))$")
+CYCLE_RE = re.compile(r"^Ciclo automático(?: #(\d+))? executado(?: com (sucesso|falhas) \((\d+)/2)?")
+MOVE_RE = re.compile(r"^Mouse movido \((\w+)\): .*\| Distância: ([\d.]+)px \| Duração: ([\d.]+)s")
+BREAKER_RE = re.compile(r"^Ação (\w+) (suspensa por|voltou a funcionar)")
+STALL_RE = re.compile(r"^Ação (\w+) travada há ([\d.]+)s")
+
+# Mensagens de resultado de cada ação: (início da mensagem, ação, sucesso)
+ACTION_MESSAGES = (
+    ("Tecla espaço pressionada", "tecla", True),
+    ("Erro ao pressionar tecla", "tecla", False),
+    ("Tentativa de clique no ícone do Teams", "teams_clique", True),
+    ("Posição do Teams fora da tela", "teams_clique", True),
+    ("Teams não acessível", "teams_clique", False),
+    ("Tecla Shift pressionada", "teams_ativo", True),
+    ("Estratégia alternativa: Ctrl pressionado", "teams_ativo", True),
+    ("Todas as estratégias de ativação falharam", "teams_ativo", False),
+    # Exceções capturadas pelo run_action do motor
+    ("Falha no movimento do mouse", "mouse", False),
+    ("Falha ao pressionar tecla", "tecla", False),
+    ("Clique no Teams falhou", "teams_clique", False),
+    ("Ativação do Teams falhou", "teams_ativo", False),
+    ("Falha ao emitir som", "som", False),
+)
+
+IMPORTED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS imported_lines (
+    ts REAL NOT NULL,
+    digest BLOB NOT NULL,
+    PRIMARY KEY (ts, digest)
+) WITHOUT ROWID;
+"""
+
+
+class LogParser:
+    """Converte linhas do cycle_log.txt nas mesmas linhas que a gravação ao vivo gera
+
+    Ao vivo cada movimento vira um evento "movimento" e cada ação uma única linha
+    "acao" (uma sequência de movimentos conta como uma execução do mouse); as
+    mensagens em si ficam como "evento". Como o resultado de algumas ações só
+    aparece em linhas seguintes (fim da sequência, estratégia alternativa do
+    Teams), o parser guarda esse estado entre as linhas de um mesmo arquivo.
+    """
+
+    def __init__(self):
+        self.cycle = None          # Ciclo em andamento (último total + 1)
+        self.sequence_ok = None    # Resultado parcial de uma sequência de movimentos
+        self.teams_failed = False  # Erro do Teams aguardando a estratégia alternativa
+
+    def parse(self, line):
+        """Retorna (ts, linhas da tabela events) ou None para linhas fora do formato"""
+        match = LINE_RE.match(line.rstrip("\n"))
+        if not match:
+            return None
+        stamp, message, total = match.groups()
+        ts = datetime.datetime.strptime(stamp, "%Y-%m-%d %H:%M:%S").timestamp()
+        if total is not None:
+            self.cycle = int(total) + 1
+            return ts, [make_row("total", ts=ts, cycle=int(total))]
+        return ts, self.parse_message(ts, message)
+
+    def action(self, ts, action, ok):
+        return make_row("acao", ts=ts, action=action, ok=ok, cycle=self.cycle)
+
+    def parse_message(self, ts, message):
+        rows = []
+        if self.teams_failed and not message.startswith(("Estratégia alternativa", "Todas as estratégias")):
+            # Log interrompido entre o erro e a estratégia alternativa
+            self.teams_failed = False
+            rows.append(self.action(ts, "teams_ativo", False))
+
+        cycle = CYCLE_RE.match(message)
+        if cycle:
+            number, _, successes = cycle.groups()
+            if number:
+                self.cycle = int(number)
+            rows.append(make_row("ciclo", message, ts=ts, cycle=self.cycle,
+                                 success_count=int(successes) if successes else None))
+            return rows
+        move = MOVE_RE.match(message)
+        if move:
+            rows.append(make_row("movimento", message, ts=ts, cycle=self.cycle,
+                                 movement_type=move.group(1), distance=float(move.group(2)),
+                                 duration=float(move.group(3))))
+            if self.sequence_ok is None:
+                rows.append(self.action(ts, "mouse", True))
+            return rows
+        breaker = BREAKER_RE.match(message)
+        if breaker:
+            rows.append(make_row("disjuntor", message, ts=ts, action=breaker.group(1),
+                                 ok=breaker.group(2) != "suspensa por"))
+            return rows
+        stall = STALL_RE.match(message)
+        if stall:
+            self.sequence_ok = None
+            rows.append(self.action(ts, stall.group(1), False))
+            rows.append(make_row("travamento", message, ts=ts, action=stall.group(1),
+                                 duration=float(stall.group(2))))
+            return rows
+        if " adiada: usuário ativo" in message:
+            rows.append(make_row("pulado", message, ts=ts))
+            return rows
+
+        rows.append(make_row("evento", message, ts=ts))
+        if message.startswith("Executando sequência de múltiplos movimentos"):
+            self.sequence_ok = True
+        elif message.startswith(("Sequência de ", "Sequência interrompida")):
+            if self.sequence_ok is not None:
+                rows.append(self.action(ts, "mouse", self.sequence_ok))
+                self.sequence_ok = None
+        elif message.startswith("Erro ao mover mouse"):
+            if self.sequence_ok is None:
+                rows.append(self.action(ts, "mouse", False))
+            else:
+                self.sequence_ok = False
+        elif message.startswith("Erro ao manter Teams ativo"):
+            self.teams_failed = True
+        else:
+            for prefix, action, ok in ACTION_MESSAGES:
+                if message.startswith(prefix):
+                    if action == "mouse":
+                        self.sequence_ok = None
+                    self.teams_failed = False
+                    rows.append(self.action(ts, action, ok))
+                    break
+        return rows
+
+
+def import_log(conn, path):
+    """Importa um cycle_log.txt (ou segmento .gz) lendo linha a linha, em lotes
+
+    Cada linha importada é registrada por (horário, resumo do texto): importar de
+    novo o mesmo arquivo, ou um log que só cresceu, grava apenas as linhas novas.
+    Retorna a quantidade de eventos gravados.
+    """
+    conn.executescript(IMPORTED_SCHEMA)
+    opener = gzip.open if path.endswith(".gz") else open
+    parser = LogParser()
+    count = 0
+    batch = []  # (horário, resumo, linhas da tabela events)
+
+    def flush():
+        rows = []
+        with conn:
+            for ts, digest, line_rows in batch:
+                cursor = conn.execute("INSERT OR IGNORE INTO imported_lines (ts, digest) VALUES (?, ?)",
+                                      (ts, digest))
+                if cursor.rowcount:
+                    rows.extend(line_rows)
+            conn.executemany(INSERT, rows)
+        batch.clear()
+        return len(rows)
+
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            # O parser vê todas as linhas (mesmo as já importadas) para manter o estado
+            parsed = parser.parse(line)
+            if parsed is None:
+                continue
+            ts, rows = parsed
+            digest = hashlib.blake2b(line.rstrip("\r\n").encode("utf-8"), digest_size=16).digest()
+            batch.append((ts, digest, rows))
+            if len(batch) >= BATCH_SIZE:
+                count += flush()
+    if batch:
+        count += flush()
+    return count
+
+
+def cycles_per_day(conn):
+    return conn.execute(
+        "SELECT date(ts, 'unixepoch', 'localtime') AS dia, count(*) FROM events "
+        "WHERE kind = 'ciclo' GROUP BY dia ORDER BY dia").fetchall()
+
+
+def failure_rate_per_action(conn):
+    return conn.execute(
+        "SELECT action, count(*), sum(ok = 0), avg(ok = 0) FROM events "
+        "WHERE kind = 'acao' "
+        "GROUP BY action ORDER BY action").fetchall()
+
+
+def average_cycle_latency(conn):
+    return conn.execute(
+        "SELECT count(duration), avg(duration), min(duration), max(duration) FROM events "
+        "WHERE kind = 'ciclo' AND duration IS NOT NULL").fetchone()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consultas ao histórico de eventos do MascoteApp")
+    parser.add_argument("--db", default="eventos.db", help="Banco SQLite de eventos (padrão: eventos.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("ciclos-por-dia", help="Ciclos executados por dia")
+    commands.add_parser("falhas-por-acao", help="Taxa de falha de cada ação")
+    commands.add_parser("latencia-media", help="Duração média dos ciclos")
+    importer = commands.add_parser("importar", help="Importa arquivos cycle_log.txt existentes")
+    importer.add_argument("logs", nargs="+", help="Arquivos de log (.txt ou .gz)")
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        if args.command == "ciclos-por-dia":
+            for day, count in cycles_per_day(conn):
+                print(f"{day}  {count:6d} ciclos")
+        elif args.command == "falhas-por-acao":
+            for action, total, failures, rate in failure_rate_per_action(conn):
+                print(f"{action:14s} {total:8d} execuções  {failures:6d} falhas  {rate * 100:6.2f}%")
+        elif args.command == "latencia-media":
+            count, average, minimum, maximum = average_cycle_latency(conn)
+            if not count:
+                print("Nenhum ciclo com duração registrada.")
+            else:
+                print(f"{count} ciclos  média {average:.3f}s  mín {minimum:.3f}s  máx {maximum:.3f}s")
+        else:
+            for path in args.logs:
+                print(f"{path}: {import_log(conn, path)} eventos importados")
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
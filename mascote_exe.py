@@ -5,30 +5,114 @@ Script para compilar o MascoteApp em um executável Windows (.exe)
 Este script automatiza o processo de criação de um executável usando PyInstaller.
 Inclui todas as dependências necessárias e arquivos de recursos (ícones, GIFs).
 
+Compilação incremental: uma impressão digital (fontes, recursos, versões do
+Python e do PyInstaller e opções de compilação) é gravada em build/. Se nada
+mudou, a compilação é pulada; se algo mudou, o PyInstaller reaproveita o cache
+de build/ em vez de começar do zero (use --limpo para o comportamento antigo).
+
+Uso:
+    python mascote_exe.py            # arquivo único (--onefile)
+    python mascote_exe.py --onedir   # pasta com o executável: inicia sem descompactar
+    python mascote_exe.py --limpo    # remove build/ e dist/ e compila do zero
+
+Antes de compilar, os recursos são otimizados em build/assets/ (os originais
+não são alterados): o GIF é requantizado sem perdas e quadros repetidos são
+unidos; o ícone mantém só os tamanhos usados. Módulos da biblioteca padrão e
+plugins do PIL que o aplicativo não carrega são excluídos, e o tamanho de dist/
+é comparado com um orçamento e com a compilação anterior.
+
 Autor: Christian Vladimir Uhdre Mulato
 Data: Campo Largo, 02 de Outubro de 2025.
 """
 
+import argparse
+import hashlib
+import json
 import os
 import sys
 import subprocess
 import shutil
+import time
 from pathlib import Path
 
+# Módulos do projeto que não fazem parte do executável
+BUILD_TOOL_MODULES = ("mascote_exe.py", "mascote_bench.py")
+
+# Tempo máximo de espera pelo executável na medição de início a frio (s)
+COLD_START_TIMEOUT = 60
+
+# Tamanhos mantidos no ícone: barra de título/tarefas (16, 32) e Explorer (48, 256)
+ICON_SIZES = ((16, 16), (32, 32), (48, 48), (256, 256))
+
+# Candidatos a exclusão: módulos que o PyInstaller alcança, mas o aplicativo não usa.
+# Só são excluídos se não forem carregados ao importar os módulos do aplicativo.
+EXCLUDE_CANDIDATES = (
+    "unittest", "doctest", "pdb", "pydoc", "pydoc_data", "lib2to3", "distutils",
+    "setuptools", "pip", "ensurepip", "venv", "idlelib", "turtle", "turtledemo",
+    "tkinter.test", "test", "xmlrpc", "curses", "multiprocessing", "asyncio",
+    "PIL.ImageQt", "PIL.ImageShow", "PIL.ImageGrab",
+)
+
+# Plugins do PIL necessários (o aplicativo só abre o GIF do mascote)
+PIL_PLUGINS_USED = ("GifImagePlugin",)
+
+# Orçamento padrão do tamanho de dist/ (MB) e crescimento tolerado por arquivo
+DEFAULT_SIZE_BUDGET_MB = {"onefile": 40.0, "onedir": 100.0}
+DEFAULT_SIZE_TOLERANCE = 0.05
+
+# Arquivos listados no relatório de tamanho
+SIZE_REPORT_TOP = 15
+
 class MascoteCompiler:
-    def __init__(self):
+    def __init__(self, onedir=False, clean=False, size_budget_mb=None,
+                 size_tolerance=DEFAULT_SIZE_TOLERANCE):
         self.script_dir = Path(__file__).parent.absolute()
+        self.onedir = onedir                # Pasta com o executável em vez de arquivo único
+        self.clean = clean                  # Ignora o cache e compila do zero
         self.source_file = self.script_dir / "mascote.py"
         self.dist_dir = self.script_dir / "dist"
         self.build_dir = self.script_dir / "build"
         self.spec_file = self.script_dir / "mascote.spec"
+        self.assets_dir = self.build_dir / "assets"   # Recursos otimizados
         
-        # Arquivos de recursos necessários
+        # Arquivos de recursos necessários (boneco.ico não é usado e não é empacotado)
         self.resource_files = [
             "mascote.gif",
             "mascote.ico",
-            "boneco.ico"
+            "mascote.frames"                # Cache de quadros gerado na compilação
         ]
+        # Recursos embutidos no executável (--add-data). Os de resource_files não entram:
+        # o aplicativo os abre do diretório de trabalho, ao lado do executável, e uma
+        # segunda cópia embutida só aumentaria o pacote e a extração do --onefile
+        self.embedded_files = []
+        self.frame_cache_file = self.assets_dir / "mascote.frames"
+        self.fingerprint_file = self.build_dir / "mascote.fingerprint.json"
+        self.size_record_file = self.script_dir / "mascote.sizes.json"  # Fora de build/: sobrevive a --limpo
+        target = "onedir" if onedir else "onefile"
+        self.size_budget_mb = size_budget_mb or DEFAULT_SIZE_BUDGET_MB[target]
+        self.size_tolerance = size_tolerance
+        self.excludes = []
+        self.build_seconds = None
+        self.cold_start_seconds = None
+        self.previous_record = {}
+
+    @property
+    def exe_name(self):
+        return "mascote.exe" if os.name == "nt" else "mascote"
+
+    @property
+    def app_dir(self):
+        """Diretório onde ficam o executável e os recursos copiados"""
+        return self.dist_dir / "mascote" if self.onedir else self.dist_dir
+
+    @property
+    def exe_path(self):
+        return self.app_dir / self.exe_name
+
+    def resource_path(self, resource):
+        """Versão otimizada do recurso (build/assets/) se existir, senão o original"""
+        optimized = self.assets_dir / resource
+        return optimized if optimized.exists() else self.script_dir / resource
         
     def check_requirements(self):
         """Verifica se todos os requisitos estão instalados"""
@@ -42,7 +126,7 @@ class MascoteCompiler:
         # Verifica arquivos de recursos
         missing_resources = []
         for resource in self.resource_files:
-            resource_path = self.script_dir / resource
+            resource_path = self.resource_path(resource)
             if not resource_path.exists():
                 missing_resources.append(resource)
                 
@@ -71,6 +155,245 @@ class MascoteCompiler:
                 print(f"❌ Erro ao instalar PyInstaller: {e}")
                 return False
                 
+    def generate_frame_cache(self):
+        """Gera o cache de quadros do GIF para ser distribuído junto do executável"""
+        print("🎞️  Gerando cache de quadros do mascote...")
+        
+        # O cache é identificado pelo hash do GIF empacotado (o otimizado)
+        gif_file = self.resource_path("mascote.gif")
+        if not gif_file.exists():
+            print(f"⚠️  {gif_file.name} não encontrado, cache de quadros não gerado.")
+            return False
+            
+        try:
+            from mascote_frames import MappedFrameProvider, build_frame_cache, gif_digest
+            self.assets_dir.mkdir(parents=True, exist_ok=True)
+            digest = gif_digest(str(gif_file))
+            # Cache já válido: não regrava (mantém a impressão digital da compilação)
+            if self.frame_cache_file.exists():
+                try:
+                    MappedFrameProvider(str(self.frame_cache_file), digest).close()
+                    print(f"✅ Cache de quadros já atualizado: {self.frame_cache_file.name}")
+                    return True
+                except (OSError, ValueError, KeyError):
+                    pass
+            build_frame_cache(str(gif_file), str(self.frame_cache_file), digest)
+        except Exception as e:
+            print(f"⚠️  Erro ao gerar cache de quadros: {e}")
+            print("   O executável decodificará o GIF na primeira execução.")
+            return False
+            
+        size_kb = self.frame_cache_file.stat().st_size / 1024
+        print(f"✅ Cache de quadros gerado: {self.frame_cache_file.name} ({size_kb:.1f} KB)")
+        return True
+        
+    def optimize_assets(self):
+        """Gera versões otimizadas (e sem perdas) dos recursos em build/assets/"""
+        print("🗜️  Otimizando recursos...")
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.assets_dir / "manifest.json"
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+
+        for resource, optimizer in (("mascote.gif", self.optimize_gif), ("mascote.ico", self.optimize_icon)):
+            source = self.script_dir / resource
+            target = self.assets_dir / resource
+            if not source.exists():
+                continue
+            digest = hashlib.sha256(source.read_bytes()).hexdigest()
+            # Original sem mudanças desde a última otimização: reaproveita o resultado
+            if manifest.get(resource) == digest and target.exists():
+                print(f"   {resource}: já otimizado ({target.stat().st_size / 1024:.1f} KB)")
+                continue
+            try:
+                optimized = optimizer(source)
+            except Exception as e:
+                print(f"⚠️  Erro ao otimizar {resource}: {e}")
+                optimized = None
+            original_size = source.stat().st_size
+            if optimized is None or len(optimized) >= original_size:
+                # Sem ganho (ou resultado não idêntico): empacota o original
+                shutil.copy2(source, target)
+                print(f"   {resource}: mantido original ({original_size / 1024:.1f} KB)")
+            else:
+                target.write_bytes(optimized)
+                print(f"   {resource}: {original_size / 1024:.1f} KB → {len(optimized) / 1024:.1f} KB")
+            manifest[resource] = digest
+
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return True
+
+    def optimize_gif(self, source):
+        """Requantiza os quadros com paleta própria e une quadros repetidos (sem perdas)
+
+        Os quadros são comparados em RGBA: a transparência faz parte do que precisa
+        ser reproduzido, e o método de descarte de cada quadro é mantido.
+        Retorna os bytes do novo GIF, ou None se algum quadro não for reproduzido exatamente.
+        """
+        import io
+        from PIL import Image, ImageSequence
+
+        def rgba(frame):
+            # Quadro composto em RGBA; a cor sob pixels transparentes não aparece e é zerada
+            image = frame.convert("RGBA")
+            alpha = image.getchannel("A")
+            if alpha.getextrema()[0] == 255:
+                return image
+            blank = Image.new("RGBA", image.size, (0, 0, 0, 0))
+            return Image.composite(image, blank, alpha.point(lambda value: 255 if value else 0))
+
+        with Image.open(source) as gif:
+            loop = gif.info.get("loop", 0)
+            frames, durations, disposals = [], [], []
+            for frame in ImageSequence.Iterator(gif):
+                image = rgba(frame)
+                duration = frame.info.get("duration", 100)
+                if frames and frames[-1].tobytes() == image.tobytes():
+                    durations[-1] += duration  # Quadro repetido: estende a duração do anterior
+                    continue
+                frames.append(image)
+                durations.append(duration)
+                disposals.append(getattr(frame, "disposal_method", 0))
+
+        # GIF só tem transparência total; paleta adaptativa só é exata com até 256 cores no quadro
+        for frame in frames:
+            if frame.getchannel("A").point(lambda value: 0 if value in (0, 255) else 255).getbbox():
+                return None
+            if frame.getcolors(256) is None:
+                return None
+        paletted = []
+        for frame in frames:
+            alpha = frame.getchannel("A")
+            rgb = frame.convert("RGB")
+            if alpha.getextrema()[0] == 255:
+                paletted.append(rgb.convert("P", palette=Image.ADAPTIVE, colors=256))
+                continue
+            # Pixels transparentes recebem uma cor ausente do quadro, que vira o índice transparente
+            used = {color for _, color in rgb.getcolors(256)}
+            key = next(color for color in ((index, 0, 255 - index) for index in range(256))
+                       if color not in used)
+            rgb.paste(key, mask=alpha.point(lambda value: 0 if value else 255))
+            image = rgb.convert("P", palette=Image.ADAPTIVE, colors=256)
+            image.info["transparency"] = image.palette.colors[key]
+            paletted.append(image)
+        buffer = io.BytesIO()
+        paletted[0].save(buffer, "GIF", save_all=True, append_images=paletted[1:],
+                         duration=durations, disposal=disposals, loop=loop, optimize=True)
+        data = buffer.getvalue()
+
+        # Confere quadro a quadro (cores e transparência) que o resultado é idêntico ao original
+        with Image.open(io.BytesIO(data)) as result:
+            decoded = [rgba(frame).tobytes() for frame in ImageSequence.Iterator(result)]
+        if decoded != [frame.tobytes() for frame in frames]:
+            return None
+        return data
+
+    def optimize_icon(self, source):
+        """Mantém no ícone apenas os tamanhos de ICON_SIZES, com os bitmaps originais"""
+        import io
+        from PIL import Image
+
+        with Image.open(source) as icon:
+            available = icon.ico.sizes()
+            sizes = [size for size in ICON_SIZES if size in available]
+            if not sizes or len(sizes) == len(available):
+                return None
+            images = [icon.ico.getimage(size).convert("RGBA") for size in sizes]
+        buffer = io.BytesIO()
+        # O maior tamanho é a imagem base; os demais entram exatamente como no original
+        images[-1].save(buffer, "ICO", sizes=sizes, append_images=images[:-1])
+        return buffer.getvalue()
+
+    def compute_excludes(self):
+        """Módulos alcançáveis pelo PyInstaller que o aplicativo nunca importa"""
+        print("🔎 Calculando módulos excluídos...")
+        candidates = list(EXCLUDE_CANDIDATES)
+        try:
+            import pkgutil
+            import PIL
+            candidates += [f"PIL.{module.name}" for module in pkgutil.iter_modules(PIL.__path__)
+                           if module.name.endswith("ImagePlugin") and module.name not in PIL_PLUGINS_USED]
+        except ImportError:
+            pass
+
+        # Importa os módulos do aplicativo em outro processo e vê o que foi carregado
+        probe = (
+            "import json, sys\n"
+            "import mascote, mascote_frames, mascote_headless, tkinter, PIL.ImageTk\n"
+            "try:\n"
+            "    import pyautogui\n"
+            "except Exception:\n"
+            "    pass\n"
+            "print(json.dumps(sorted(sys.modules)))\n"
+        )
+        try:
+            result = subprocess.run([sys.executable, "-c", probe], cwd=str(self.script_dir),
+                                    check=True, capture_output=True, text=True)
+            loaded = set(json.loads(result.stdout.strip().splitlines()[-1]))
+        except (OSError, subprocess.SubprocessError, ValueError, IndexError) as e:
+            print(f"⚠️  Não foi possível calcular as exclusões: {e}")
+            self.excludes = []
+            return self.excludes
+
+        def used(name):
+            return any(module == name or module.startswith(name + ".") for module in loaded)
+
+        self.excludes = sorted(name for name in candidates if not used(name))
+        print(f"   {len(self.excludes)} módulos excluídos")
+        return self.excludes
+
+    def source_files(self):
+        """Fontes Python empacotadas no executável"""
+        return sorted(path for path in self.script_dir.glob("mascote*.py")
+                      if path.name not in BUILD_TOOL_MODULES)
+
+    def pyinstaller_version(self):
+        try:
+            import PyInstaller
+            return PyInstaller.__version__
+        except ImportError:
+            return None
+
+    def compute_fingerprint(self):
+        """Hash das fontes, dos recursos, das versões e das opções de compilação"""
+        digest = hashlib.sha256()
+        resources = [self.resource_path(resource) for resource in self.resource_files]
+        for path in self.source_files() + [path for path in resources if path.exists()]:
+            digest.update(path.name.encode("utf-8") + b"\0")
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+        digest.update(f"pyinstaller={self.pyinstaller_version()}".encode("utf-8"))
+        digest.update(f"python={sys.version}".encode("utf-8"))
+        digest.update(" ".join(self.pyinstaller_options()).encode("utf-8"))
+        return digest.hexdigest()
+
+    def load_build_record(self):
+        try:
+            with open(self.fingerprint_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_build_record(self, fingerprint):
+        self.build_dir.mkdir(exist_ok=True)
+        record = {
+            "fingerprint": fingerprint,
+            "target": "onedir" if self.onedir else "onefile",
+            "build_seconds": self.build_seconds,
+            "cold_start_seconds": self.cold_start_seconds,
+        }
+        with open(self.fingerprint_file, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+
+    def is_up_to_date(self, fingerprint):
+        """Nada mudou desde a última compilação e o executável ainda existe"""
+        if self.clean or not self.exe_path.exists():
+            return False
+        return self.load_build_record().get("fingerprint") == fingerprint
+
     def clean_previous_builds(self):
         """Remove builds anteriores"""
         print("🧹 Limpando builds anteriores...")
@@ -86,35 +409,60 @@ class MascoteCompiler:
             self.spec_file.unlink()
             print(f"   Removido: {self.spec_file}")
             
+    def pyinstaller_options(self):
+        """Opções do PyInstaller (sem caminhos absolutos, para entrar na impressão digital)"""
+        icon = self.resource_path("mascote.ico").relative_to(self.script_dir).as_posix()
+        options = [
+            "--onedir" if self.onedir else "--onefile",  # Pasta (início rápido) ou arquivo único
+            "--windowed",                   # Sem console
+            "--name", "mascote",            # Nome do executável
+            "--icon", icon,                 # Ícone do executável (otimizado)
+            "--noconfirm",                  # Não pede confirmação
+        ]
+        if self.clean:
+            options.append("--clean")       # Limpa cache
+        # Adiciona arquivos de dados (recursos); separador ";" no Windows e ":" nos demais
+        for resource in self.embedded_files:
+            resource_path = self.resource_path(resource)
+            if resource_path.exists():
+                relative = resource_path.relative_to(self.script_dir).as_posix()
+                options.extend(["--add-data", f"{relative}{os.pathsep}."])
+        # Módulos que o aplicativo não usa
+        for module in self.excludes:
+            options.extend(["--exclude-module", module])
+        return options
+
+    def remove_other_target(self):
+        """Remove a saída do outro formato (no Linux, dist/mascote é o arquivo ou a pasta)"""
+        other = self.dist_dir / "mascote" if not self.onedir else self.dist_dir / self.exe_name
+        if not self.onedir and other.is_dir():
+            shutil.rmtree(other)
+            print(f"   Removido: {other}")
+        elif self.onedir and other.is_file():
+            other.unlink()
+            print(f"   Removido: {other}")
+
     def create_executable(self):
         """Cria o executável usando PyInstaller"""
         print("🔨 Compilando executável...")
+        self.remove_other_target()
         
         # Monta comando do PyInstaller
         cmd = [
             sys.executable, "-m", "PyInstaller",
-            "--onefile",                    # Arquivo único
-            "--windowed",                   # Sem console
-            "--name", "mascote",            # Nome do executável
-            "--icon", "mascote.ico",        # Ícone do executável
+            *self.pyinstaller_options(),
             "--distpath", str(self.dist_dir),  # Diretório de saída
-            "--workpath", str(self.build_dir), # Diretório de trabalho
-            "--clean",                      # Limpa cache
-            "--noconfirm",                  # Não pede confirmação
+            "--workpath", str(self.build_dir), # Diretório de trabalho (cache reaproveitado)
         ]
-        
-        # Adiciona arquivos de dados (recursos)
-        for resource in self.resource_files:
-            resource_path = self.script_dir / resource
-            if resource_path.exists():
-                cmd.extend(["--add-data", f"{resource_path};."])
                 
         # Adiciona arquivo principal
         cmd.append(str(self.source_file))
         
         try:
             print(f"   Executando: {' '.join(cmd)}")
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            # Caminhos relativos de --add-data/--icon são resolvidos a partir daqui
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True,
+                                    cwd=str(self.script_dir))
             print("✅ Compilação concluída com sucesso!")
             return True
             
@@ -129,17 +477,18 @@ class MascoteCompiler:
         """Copia recursos necessários para o diretório dist"""
         print("📋 Copiando recursos adicionais...")
         
-        if not self.dist_dir.exists():
-            print("❌ Diretório dist não encontrado!")
+        if not self.app_dir.exists():
+            print(f"❌ Diretório {self.app_dir} não encontrado!")
             return False
             
         # Copia arquivos de recursos para junto do executável
+        relative_dir = self.app_dir.relative_to(self.script_dir).as_posix()
         for resource in self.resource_files:
-            resource_path = self.script_dir / resource
+            resource_path = self.resource_path(resource)
             if resource_path.exists():
-                dest_path = self.dist_dir / resource
+                dest_path = self.app_dir / resource
                 shutil.copy2(resource_path, dest_path)
-                print(f"   Copiado: {resource} → dist/")
+                print(f"   Copiado: {resource} → {relative_dir}/")
                 
         return True
         
@@ -147,15 +496,15 @@ class MascoteCompiler:
         """Verifica se o executável foi criado corretamente"""
         print("✅ Verificando executável...")
         
-        exe_path = self.dist_dir / "mascote.exe"
+        exe_path = self.exe_path
         if exe_path.exists():
             size_mb = exe_path.stat().st_size / (1024 * 1024)
             print(f"✅ Executável criado: {exe_path}")
             print(f"   Tamanho: {size_mb:.2f} MB")
             
-            # Lista todos os arquivos no diretório dist
-            print("📁 Conteúdo do diretório dist:")
-            for item in self.dist_dir.iterdir():
+            # Lista todos os arquivos no diretório do executável
+            print(f"📁 Conteúdo do diretório {self.app_dir.name}:")
+            for item in self.app_dir.iterdir():
                 if item.is_file():
                     item_size = item.stat().st_size / 1024
                     print(f"   📄 {item.name} ({item_size:.1f} KB)")
@@ -165,10 +514,104 @@ class MascoteCompiler:
             print("❌ Executável não foi criado!")
             return False
             
+    def check_size_budget(self):
+        """Relatório de tamanho por arquivo; falha acima do orçamento ou se algum arquivo crescer"""
+        print("📏 Verificando tamanho do pacote...")
+        target = "onedir" if self.onedir else "onefile"
+        sizes = {item.relative_to(self.app_dir).as_posix(): item.stat().st_size
+                 for item in self.app_dir.rglob("*") if item.is_file()}
+        try:
+            with open(self.size_record_file, encoding="utf-8") as f:
+                previous = json.load(f).get(target, {})
+        except (OSError, ValueError):
+            previous = {}
+
+        regressions = []
+        for name, size in sizes.items():
+            before = previous.get(name)
+            if before and size > before * (1 + self.size_tolerance):
+                regressions.append((name, before, size))
+
+        total = sum(sizes.values())
+        budget = self.size_budget_mb * 1024 * 1024
+        print(f"   {'arquivo':<56}{'tamanho':>12}{'anterior':>12}")
+        for name, size in sorted(sizes.items(), key=lambda item: -item[1])[:SIZE_REPORT_TOP]:
+            before = previous.get(name)
+            before_text = "-" if before is None else f"{before / 1024:.1f} KB"
+            print(f"   {name:<56}{size / 1024:>9.1f} KB{before_text:>12}")
+        if len(sizes) > SIZE_REPORT_TOP:
+            print(f"   ... mais {len(sizes) - SIZE_REPORT_TOP} arquivos")
+        print(f"   Total: {total / (1024 * 1024):.2f} MB (orçamento: {self.size_budget_mb:.1f} MB)")
+
+        ok = True
+        if total > budget:
+            print(f"❌ Pacote acima do orçamento em {(total - budget) / (1024 * 1024):.2f} MB")
+            ok = False
+        for name, before, size in regressions:
+            print(f"❌ {name} cresceu de {before / 1024:.1f} KB para {size / 1024:.1f} KB "
+                  f"(tolerância: {self.size_tolerance:.0%})")
+            ok = False
+        if not ok:
+            return False
+
+        # Só uma compilação aprovada vira a nova referência
+        try:
+            with open(self.size_record_file, encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            record = {}
+        record[target] = sizes
+        with open(self.size_record_file, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+        return True
+
+    def measure_cold_start(self):
+        """Tempo do lançamento do executável até o primeiro quadro desenhado"""
+        print("⏱️  Medindo início a frio do executável...")
+        started = time.perf_counter()
+        try:
+            # --medir-inicio: abre a janela, desenha o primeiro quadro e sai
+            subprocess.run([str(self.exe_path), "--medir-inicio"], cwd=str(self.app_dir),
+                           check=True, capture_output=True, timeout=COLD_START_TIMEOUT)
+        except subprocess.CalledProcessError as e:
+            # Sem tela (ex.: CI), o executável não consegue abrir a janela
+            lines = [line for line in e.stderr.decode(errors="replace").strip().splitlines()
+                     if not line.startswith("[PYI")]
+            print(f"⚠️  Não foi possível medir o início do executável: {lines[-1] if lines else e}")
+            return None
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"⚠️  Não foi possível medir o início do executável: {e}")
+            return None
+        self.cold_start_seconds = time.perf_counter() - started
+        return self.cold_start_seconds
+
+    def report_timings(self):
+        """Tempo de compilação e de início a frio lado a lado (com a compilação anterior)"""
+        def fmt(seconds):
+            return "-" if seconds is None else f"{seconds:.2f} s"
+
+        target = "onedir" if self.onedir else "onefile"
+        print(f"📊 Tempos ({target}):")
+        print(f"   {'':<12}{'compilação':>14}{'início a frio':>16}")
+        if self.previous_record.get("target") == target:
+            print(f"   {'anterior':<12}{fmt(self.previous_record.get('build_seconds')):>14}"
+                  f"{fmt(self.previous_record.get('cold_start_seconds')):>16}")
+        print(f"   {'atual':<12}{fmt(self.build_seconds):>14}{fmt(self.cold_start_seconds):>16}")
+
     def run_compilation(self):
         """Executa todo o processo de compilação"""
-        print("🚀 Iniciando compilação do MascoteApp para Windows")
+        print(f"🚀 Iniciando compilação do MascoteApp ({'onedir' if self.onedir else 'onefile'})")
         print("=" * 60)
+        started = time.perf_counter()
+
+        # Limpa builds anteriores (só com --limpo; sem ele o cache de build/ é reaproveitado)
+        if self.clean:
+            self.clean_previous_builds()
+
+        # Otimiza os recursos e gera o cache de quadros a partir do GIF otimizado
+        self.optimize_assets()
+        self.generate_frame_cache()
+        self.compute_excludes()
         
         # Verifica requisitos
         if not self.check_requirements():
@@ -177,9 +620,14 @@ class MascoteCompiler:
         # Instala PyInstaller
         if not self.install_pyinstaller():
             return False
-            
-        # Limpa builds anteriores
-        self.clean_previous_builds()
+
+        # Compilação incremental: nada mudou, nada a fazer
+        fingerprint = self.compute_fingerprint()
+        self.previous_record = self.load_build_record()
+        if self.is_up_to_date(fingerprint):
+            print("✅ Nada mudou desde a última compilação; executável reaproveitado.")
+            print(f"📁 Executável disponível em: {self.exe_path}")
+            return True
         
         # Cria executável
         if not self.create_executable():
@@ -192,23 +640,46 @@ class MascoteCompiler:
         # Verifica resultado
         if not self.verify_executable():
             return False
+        self.build_seconds = time.perf_counter() - started
+
+        # Orçamento de tamanho: regressões falham a compilação
+        if not self.check_size_budget():
+            return False
+
+        self.measure_cold_start()
+        self.report_timings()
+        self.save_build_record(fingerprint)
             
         print("=" * 60)
         print("🎉 COMPILAÇÃO CONCLUÍDA COM SUCESSO!")
-        print(f"📁 Executável disponível em: {self.dist_dir / 'mascote.exe'}")
+        print(f"📁 Executável disponível em: {self.exe_path}")
         print()
         print("💡 Para distribuir o aplicativo:")
-        print(f"   1. Copie todo o conteúdo da pasta: {self.dist_dir}")
-        print("   2. Execute o arquivo mascote.exe")
+        print(f"   1. Copie todo o conteúdo da pasta: {self.app_dir}")
+        print(f"   2. Execute o arquivo {self.exe_name}")
         print()
         print("⚠️  Certifique-se de que os arquivos de recursos estão junto do .exe")
         
         return True
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compila o MascoteApp com o PyInstaller")
+    parser.add_argument("--onedir", action="store_true",
+                        help="Gera uma pasta com o executável (início quase imediato, sem descompactar)")
+    parser.add_argument("--limpo", action="store_true",
+                        help="Remove build/ e dist/ e compila do zero, ignorando o cache")
+    parser.add_argument("--orcamento-mb", type=float, metavar="MB",
+                        help="Tamanho máximo de dist/ (padrão: 40 MB onefile, 100 MB onedir)")
+    parser.add_argument("--tolerancia", type=float, default=DEFAULT_SIZE_TOLERANCE,
+                        help="Crescimento tolerado por arquivo em relação à compilação anterior (padrão: 0.05)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Função principal"""
+    args = parse_args(argv)
     try:
-        compiler = MascoteCompiler()
+        compiler = MascoteCompiler(onedir=args.onedir, clean=args.limpo, size_budget_mb=args.orcamento_mb,
+                                   size_tolerance=args.tolerancia)
         success = compiler.run_compilation()
         
         if success:
@@ -217,10 +688,10 @@ def main():
             # Pergunta se quer testar o executável
             test_exe = input("\n🧪 Deseja testar o executável agora? (s/n): ").lower().strip()
             if test_exe in ['s', 'sim', 'y', 'yes']:
-                exe_path = compiler.dist_dir / "mascote.exe"
+                exe_path = compiler.exe_path
                 if exe_path.exists():
                     print("🚀 Executando teste do executável...")
-                    subprocess.Popen([str(exe_path)], cwd=str(compiler.dist_dir))
+                    subprocess.Popen([str(exe_path)], cwd=str(compiler.app_dir))
                     print("   Executável iniciado em processo separado")
                     
         else:
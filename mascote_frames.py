@@ -0,0 +1,483 @@
+"""
+Provedor de quadros do mascote animado
+
+Decodifica os quadros do GIF sob demanda (alguns quadros à frente da animação)
+e os mantém em um cache LRU limitado por um orçamento de bytes. Os quadros são
+guardados em forma compacta, indexada por paleta, e só viram PhotoImage no
+momento em que são exibidos.
+
+Também gera e lê um cache de quadros em disco (mascote.frames) ao lado do GIF,
+identificado pelo hash do conteúdo do GIF. Nas execuções seguintes o cache é
+mapeado em memória (mmap) e nenhum quadro precisa ser decodificado. O cache
+guarda também o tamanho e a data de modificação do GIF: enquanto eles não
+mudam, o GIF nem é lido; o hash só é recalculado quando mudam.
+
+O cache em disco guarda também, para cada quadro, os retângulos em que ele
+difere do anterior. O FrameRenderer desenha a animação em um único PhotoImage
+persistente: a cada troca copia só esses retângulos (ou o quadro inteiro quando
+quase tudo mudou), então o custo por quadro acompanha os pixels alterados.
+
+O AnimationScheduler decide qual quadro exibir a cada despertar respeitando a
+duração de cada quadro no GIF, descarta quadros quando fica para trás e pode
+limitar a taxa de quadros (modo economia).
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import functools
+import hashlib
+import json
+import mmap
+import os
+import struct
+import math
+import threading
+from collections import OrderedDict, deque
+from PIL import Image, ImageChops
+
+# Orçamento padrão do cache de quadros (bytes)
+DEFAULT_CACHE_BYTES = 8 * 1024 * 1024
+
+# Quantidade padrão de quadros decodificados à frente da animação
+DEFAULT_LOOKAHEAD = 2
+
+# Duração usada quando o GIF não informa a duração do quadro (ms)
+DEFAULT_FRAME_DURATION = 100
+
+# Cabeçalho do cache em disco: assinatura + tamanho do índice JSON
+CACHE_MAGIC = b"MASCFRM2"
+CACHE_HEADER = struct.Struct("<8sI")
+
+# Taxa máxima de quadros no modo economia (quadros por segundo)
+LOW_POWER_FPS = 5
+
+# Atraso máximo recuperado descartando quadros; acima disso a animação recomeça do quadro atual (s)
+MAX_CATCHUP = 1.0
+
+# Janela usada para medir despertares por segundo (s)
+WAKEUP_WINDOW = 1.0
+
+# Lado dos blocos comparados entre quadros consecutivos (px)
+DELTA_TILE = 16
+
+# Fração da área alterada acima da qual o quadro é desenhado inteiro
+DELTA_MAX_RATIO = 0.5
+
+
+def compact_frame(frame):
+    """Converte o quadro para a forma mais compacta sem perdas"""
+    if frame.mode == "P":
+        return frame.copy()
+    if frame.mode == "RGB" and frame.getcolors(256) is not None:
+        # Até 256 cores: a paleta adaptativa reproduz o quadro exatamente
+        return frame.convert("P", palette=Image.Palette.ADAPTIVE, colors=256)
+    return frame.copy()
+
+
+def frame_delta(previous, current, tile=DELTA_TILE, max_ratio=DELTA_MAX_RATIO):
+    """Retângulos (x0, y0, x1, y1) em que current difere de previous; None se quase tudo mudou
+
+    Os quadros são comparados em blocos de tile x tile pixels; blocos alterados
+    vizinhos na mesma linha viram um único retângulo.
+    """
+    diff = ImageChops.difference(previous.convert("RGBA"), current.convert("RGBA"))
+    mask = functools.reduce(ImageChops.lighter, diff.split()).point(lambda value: 255 if value else 0)
+    # Média por bloco: qualquer pixel alterado deixa o bloco diferente de zero
+    tiles = mask.reduce(tile)
+    columns, rows = tiles.size
+    data = tiles.tobytes()
+    width, height = current.size
+    rects = []
+    area = 0
+    for row in range(rows):
+        column = 0
+        while column < columns:
+            if not data[row * columns + column]:
+                column += 1
+                continue
+            start = column
+            while column < columns and data[row * columns + column]:
+                column += 1
+            rect = (start * tile, row * tile, min(width, column * tile), min(height, (row + 1) * tile))
+            rects.append(rect)
+            area += (rect[2] - rect[0]) * (rect[3] - rect[1])
+    if area > max_ratio * width * height:
+        return None
+    return rects
+
+
+def frame_nbytes(frame):
+    """Estima a memória ocupada por um quadro decodificado"""
+    width, height = frame.size
+    size = width * height * len(frame.getbands())
+    if frame.mode == "P":
+        size += 768  # Paleta RGB de 256 entradas
+    return size
+
+
+class GifFrameProvider:
+    def __init__(self, path, max_bytes=DEFAULT_CACHE_BYTES, lookahead=DEFAULT_LOOKAHEAD):
+        # Abrir o GIF lê apenas o cabeçalho; nenhum quadro é decodificado aqui
+        self._gif = Image.open(path)
+        self.size = self._gif.size
+        self.max_bytes = max_bytes
+        self.lookahead = lookahead
+        self._frame_count = None
+        self._cache = OrderedDict()  # índice -> (quadro compacto, duração, bytes)
+        self._cache_bytes = 0
+        # Estimativa até o quadro ser decodificado: duração informada no primeiro quadro
+        self._last_duration = self._gif.info.get("duration") or DEFAULT_FRAME_DURATION
+
+    @property
+    def frame_count(self):
+        """Número de quadros do GIF (calculado na primeira consulta)"""
+        if self._frame_count is None:
+            self._frame_count = getattr(self._gif, "n_frames", 1)
+        return self._frame_count
+
+    @property
+    def cache_bytes(self):
+        return self._cache_bytes
+
+    def get(self, index):
+        """Retorna (quadro, duração em ms) do índice pedido"""
+        entry = self._cache.get(index)
+        if entry is not None:
+            self._cache.move_to_end(index)
+            return entry[0], entry[1]
+        frame, duration = self._decode(index)
+        self._store(index, frame, duration)
+        return frame, duration
+
+    def duration(self, index):
+        """Duração do quadro em ms sem decodificá-lo (estimada se ainda não estiver no cache)"""
+        entry = self._cache.get(index)
+        return entry[1] if entry is not None else self._last_duration
+
+    def delta(self, index):
+        # Sem cache em disco as diferenças não foram calculadas: o quadro é desenhado inteiro
+        return None
+
+    def prefetch(self, index):
+        """Decodifica os próximos quadros a partir do índice, se ainda não estiverem no cache"""
+        count = self.frame_count
+        for offset in range(self.lookahead):
+            next_index = (index + offset) % count
+            if next_index not in self._cache:
+                frame, duration = self._decode(next_index)
+                self._store(next_index, frame, duration)
+
+    def close(self):
+        self._cache.clear()
+        self._cache_bytes = 0
+        self._gif.close()
+
+    def _decode(self, index):
+        # Avançar um quadro é incremental; voltar faz o PIL reiniciar do quadro 0
+        self._gif.seek(index)
+        duration = self._gif.info.get("duration") or DEFAULT_FRAME_DURATION
+        self._last_duration = duration
+        return compact_frame(self._gif), duration
+
+    def _store(self, index, frame, duration):
+        size = frame_nbytes(frame)
+        self._cache[index] = (frame, duration, size)
+        self._cache_bytes += size
+        # Descarta os quadros menos usados até caber no orçamento (mantém sempre o atual)
+        while self._cache_bytes > self.max_bytes and len(self._cache) > 1:
+            _, (_, _, old_size) = self._cache.popitem(last=False)
+            self._cache_bytes -= old_size
+
+
+class AnimationScheduler:
+    def __init__(self, frames, low_power_fps=LOW_POWER_FPS):
+        self.frames = frames
+        self.low_power = False
+        self.low_power_fps = low_power_fps
+        self.paused = False
+        self.index = 0
+        self.dropped_frames = 0
+        self._due = None  # Instante (relógio monotônico) da troca do quadro atual
+        self._wakeups = deque()
+
+    def tick(self, now):
+        """Retorna (índice do quadro a exibir, atraso em ms até o próximo despertar)"""
+        self._wakeups.append(now)
+        if self._due is None:
+            self._due = now + self.frames.duration(self.index) / 1000
+        elif now - self._due > MAX_CATCHUP:
+            # Atraso grande demais (sistema suspenso, por exemplo): recomeça sem recuperar
+            self._due = now + self.frames.duration(self.index) / 1000
+        else:
+            # Avança pelos quadros vencidos; os intermediários são descartados
+            count = self.frames.frame_count
+            skipped = 0
+            while now >= self._due:
+                self.index = (self.index + 1) % count
+                self._due += self.frames.duration(self.index) / 1000
+                skipped += 1
+            if skipped > 1:
+                self.dropped_frames += skipped - 1
+
+        delay = self._due - now
+        if self.low_power:
+            delay = max(delay, 1 / self.low_power_fps)
+        return self.index, max(1, math.ceil(delay * 1000))
+
+    def pause(self):
+        self.paused = True
+        self._due = None
+        self._wakeups.clear()
+
+    def resume(self):
+        # O quadro atual volta a contar sua duração a partir do próximo despertar
+        self.paused = False
+        self._due = None
+
+    def wakeups_per_second(self, now):
+        """Despertares por segundo na última janela de medição"""
+        while self._wakeups and now - self._wakeups[0] > WAKEUP_WINDOW:
+            self._wakeups.popleft()
+        return len(self._wakeups) / WAKEUP_WINDOW
+
+
+def gif_digest(path):
+    """Hash SHA-256 do conteúdo do GIF (chave do cache em disco)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def gif_stamp(path):
+    """Tamanho e data de modificação do GIF: conferidos antes de recorrer ao hash"""
+    info = os.stat(path)
+    return [info.st_size, info.st_mtime_ns]
+
+
+def cache_path_for(gif_path):
+    """Caminho do cache de quadros ao lado do GIF (mascote.gif -> mascote.frames)"""
+    return os.path.splitext(gif_path)[0] + ".frames"
+
+
+def build_frame_cache(gif_path, cache_path=None, digest=None):
+    """Decodifica todos os quadros do GIF e grava o cache em disco"""
+    cache_path = cache_path or cache_path_for(gif_path)
+    # Lido antes do conteúdo: uma alteração durante a geração invalida o cache na próxima execução
+    stamp = gif_stamp(gif_path)
+    digest = digest or gif_digest(gif_path)
+    index = []
+    chunks = []
+    offset = 0
+    frames = []
+    with Image.open(gif_path) as gif:
+        for frame_index in range(getattr(gif, "n_frames", 1)):
+            gif.seek(frame_index)
+            duration = gif.info.get("duration") or DEFAULT_FRAME_DURATION
+            frame = compact_frame(gif)
+            frames.append(frame)
+            entry = {"mode": frame.mode, "duration": duration}
+            if frame.mode == "P":
+                palette = bytes(frame.getpalette() or b"")
+                entry["palette"] = [offset, len(palette)]
+                chunks.append(palette)
+                offset += len(palette)
+            data = frame.tobytes()
+            entry["data"] = [offset, len(data)]
+            chunks.append(data)
+            offset += len(data)
+            if "transparency" in frame.info:
+                entry["transparency"] = frame.info["transparency"]
+            index.append(entry)
+        size = gif.size
+    # Diferenças em relação ao quadro anterior (o primeiro vem depois do último: a animação é cíclica)
+    for frame_index, entry in enumerate(index):
+        entry["rects"] = frame_delta(frames[frame_index - 1], frames[frame_index])
+    header = json.dumps({"digest": digest, "stamp": stamp, "size": list(size),
+                         "frames": index}).encode("utf-8")
+
+    # Grava em arquivo temporário e troca atomicamente para nunca expor cache parcial
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(CACHE_HEADER.pack(CACHE_MAGIC, len(header)))
+            f.write(header)
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return cache_path
+
+
+class MappedFrameProvider:
+    def __init__(self, cache_path, digest=None):
+        self._file = open(cache_path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, header_len = CACHE_HEADER.unpack_from(self._map, 0)
+            if magic != CACHE_MAGIC:
+                raise ValueError(f"Cache de quadros inválido: {cache_path}")
+            header = json.loads(self._map[CACHE_HEADER.size:CACHE_HEADER.size + header_len])
+            if digest is not None and header["digest"] != digest:
+                raise ValueError(f"Cache de quadros desatualizado: {cache_path}")
+        except Exception:
+            self.close()
+            raise
+        self._base = CACHE_HEADER.size + header_len
+        self.digest = header["digest"]
+        self.stamp = header.get("stamp")
+        self._index = header["frames"]
+        self.size = tuple(header["size"])
+        self.frame_count = len(self._index)
+
+    @property
+    def cache_bytes(self):
+        # Os quadros vivem no page cache do sistema, não no heap do processo
+        return 0
+
+    def get(self, index):
+        """Retorna (quadro, duração em ms) lido diretamente do mapeamento"""
+        entry = self._index[index]
+        start, length = entry["data"]
+        start += self._base
+        frame = Image.frombuffer(entry["mode"], self.size, self._map[start:start + length],
+                                 "raw", entry["mode"], 0, 1)
+        if "palette" in entry:
+            start, length = entry["palette"]
+            start += self._base
+            frame.putpalette(self._map[start:start + length])
+        if "transparency" in entry:
+            frame.info["transparency"] = entry["transparency"]
+        return frame, entry["duration"]
+
+    def duration(self, index):
+        return self._index[index]["duration"]
+
+    def delta(self, index):
+        """Retângulos alterados em relação ao quadro anterior, ou None (quadro inteiro)"""
+        return self._index[index]["rects"]
+
+    def prefetch(self, index):
+        # Nada a decodificar: os quadros já estão prontos no arquivo mapeado
+        pass
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+def rgba_frame(frame):
+    """Quadro em RGBA; no modo P o índice transparente do GIF vira alfa (como no ImageTk.PhotoImage)"""
+    if frame.mode == "RGBA":
+        return frame
+    # convert não altera o quadro, que pode estar no cache do provedor
+    return frame.convert("RGBA")
+
+
+class FrameRenderer:
+    """Desenha os quadros em um único PhotoImage persistente, atualizando só o que mudou"""
+
+    def __init__(self, frames, tk_root):
+        # ImageTk só é carregado com a interface
+        from PIL import ImageTk
+        self._imagetk = ImageTk
+        self._tk = tk_root.tk
+        self.frames = frames
+        self.photo = None
+        self._scratch = None   # PhotoImage auxiliar do tamanho do quadro: recebe as regiões alteradas
+        self.index = None
+        self.full_draws = 0
+        self.delta_draws = 0
+        self.pixels_drawn = 0
+        width, height = frames.size
+        self._full_area = width * height
+
+    def show(self, index):
+        """Atualiza o PhotoImage para o quadro indicado e o retorna"""
+        if index == self.index:
+            return self.photo
+        steps = self._plan(index)
+        if steps is None:
+            frame, _ = self.frames.get(index)
+            if self.photo is None:
+                # Sempre RGBA: um quadro opaco no início não pode tirar a transparência dos seguintes
+                self.photo = self._imagetk.PhotoImage("RGBA", self.frames.size)
+                self._scratch = self._imagetk.PhotoImage("RGBA", self.frames.size)
+            self.photo.paste(rgba_frame(frame))
+            self.full_draws += 1
+            self.pixels_drawn += self._full_area
+        else:
+            # Quadros pulados pelo AnimationScheduler também têm suas diferenças aplicadas, em ordem
+            for step, rects in steps:
+                frame, _ = self.frames.get(step)
+                for rect in rects:
+                    self._patch(frame.crop(rect), rect[0], rect[1])
+                    self.pixels_drawn += (rect[2] - rect[0]) * (rect[3] - rect[1])
+            self.delta_draws += 1
+        self.index = index
+        return self.photo
+
+    def _plan(self, index):
+        # Lista de (quadro, retângulos) do quadro exibido até o pedido; None se for mais barato redesenhar tudo
+        if self.photo is None:
+            return None
+        count = self.frames.frame_count
+        steps = []
+        area = 0
+        step = self.index
+        while step != index:
+            step = (step + 1) % count
+            rects = self.frames.delta(step)
+            if rects is None:
+                return None
+            area += sum((rect[2] - rect[0]) * (rect[3] - rect[1]) for rect in rects)
+            if area > self._full_area:
+                return None
+            steps.append((step, rects))
+        return steps
+
+    def _patch(self, region, x, y):
+        # A região vai para o canto do PhotoImage auxiliar (sem criar outro) e o Tk a copia para o exibido
+        width, height = region.size
+        self._scratch.paste(rgba_frame(region))
+        self._tk.call(str(self.photo), "copy", str(self._scratch), "-from", 0, 0, width, height,
+                      "-to", x, y, "-compositingrule", "set")
+
+
+def open_frames(gif_path, cache_path=None, **kwargs):
+    """Abre os quadros do GIF usando o cache em disco quando estiver válido
+
+    Se o cache não existir ou estiver desatualizado, os quadros são decodificados
+    sob demanda nesta execução e o cache é reconstruído em segundo plano.
+    """
+    cache_path = cache_path or cache_path_for(gif_path)
+    digest = None
+    if os.path.exists(cache_path):
+        try:
+            provider = MappedFrameProvider(cache_path)
+        except (OSError, ValueError, KeyError):
+            provider = None  # Cache inválido: será reconstruído
+        if provider is not None:
+            if provider.stamp == gif_stamp(gif_path):
+                return provider
+            # Tamanho ou data mudaram: só o hash diz se o conteúdo também mudou
+            digest = gif_digest(gif_path)
+            if provider.digest == digest:
+                return provider
+            provider.close()
+
+    def rebuild():
+        try:
+            build_frame_cache(gif_path, cache_path, digest)
+        except Exception as e:
+            print("Erro ao gerar cache de quadros:", e)
+
+    threading.Thread(target=rebuild, daemon=True).start()
+    return GifFrameProvider(gif_path, **kwargs)
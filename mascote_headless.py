@@ -0,0 +1,218 @@
+"""
+Modo sem interface do MascoteApp (--headless)
+
+Executa apenas o motor de ciclos, sem janela: tkinter e PIL nunca são
+importados e o GIF não é decodificado. As opções vêm da linha de comando ou de
+um arquivo .ini (seção [mascote]); a linha de comando tem prioridade.
+
+Exemplo de arquivo de configuração:
+    [mascote]
+    intervalo = 300
+    som = false
+    log = cycle_log.txt
+    eventos_db = eventos.db
+    entrada = pyautogui
+    metricas_porta = 9464
+    status_arquivo = mascote_status.json
+    tarefas = tecla:60:5, mouse:45
+    pontos_por_segundo = 60
+    deteccao_atividade = true
+
+Sem tarefas, o ciclo completo é executado a cada "intervalo" segundos.
+
+SIGINT/SIGTERM encerram os ciclos e gravam o log pendente; SIGHUP (quando
+disponível) força a gravação do log sem encerrar. Pelo canal de controle
+(mascote_control.py) é possível ativar, desativar, mudar o intervalo, consultar
+o status e encerrar.
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import configparser
+import signal
+import sys
+import threading
+from mascote_engine import CycleEngine, parse_job_spec
+from mascote_events import EventStore
+from mascote_input import create_backend
+from mascote_log import LogWriter
+from mascote_metrics import start_exporters
+
+DEFAULT_OPTIONS = {
+    "intervalo": 300,
+    "som": False,
+    "log": "cycle_log.txt",
+    "eventos_db": None,
+    "entrada": "pyautogui",
+    "metricas_porta": None,
+    "status_arquivo": None,
+    "tarefas": None,
+    "pontos_por_segundo": None,
+    "deteccao_atividade": True,
+}
+
+# Intervalo de verificação dos sinais na thread principal (s); no Windows uma
+# espera sem limite de tempo não seria interrompida pelo Ctrl+C
+SIGNAL_POLL = 1.0
+
+
+def load_config(path):
+    """Lê as opções da seção [mascote] de um arquivo .ini"""
+    parser = configparser.ConfigParser()
+    if not parser.read(path, encoding="utf-8"):
+        raise FileNotFoundError(f"Arquivo de configuração não encontrado: {path}")
+    if not parser.has_section("mascote"):
+        return {}
+    section = parser["mascote"]
+    options = {}
+    if "intervalo" in section:
+        options["intervalo"] = section.getint("intervalo")
+    for key in ("som", "deteccao_atividade"):
+        if key in section:
+            options[key] = section.getboolean(key)
+    for key in ("metricas_porta", "pontos_por_segundo"):
+        if key in section:
+            options[key] = section.getint(key)
+    for key in ("log", "eventos_db", "entrada", "status_arquivo"):
+        if key in section:
+            options[key] = section.get(key) or None
+    if "tarefas" in section:
+        options["tarefas"] = [spec for spec in section.get("tarefas").split(",") if spec.strip()] or None
+    return options
+
+
+def resolve_options(args):
+    """Combina padrões, arquivo de configuração e linha de comando (nessa ordem)"""
+    options = dict(DEFAULT_OPTIONS)
+    if args.config:
+        options.update(load_config(args.config))
+    cli = {
+        "intervalo": args.intervalo,
+        "som": args.som,
+        "log": args.log,
+        "eventos_db": args.eventos_db,
+        "entrada": args.entrada,
+        "metricas_porta": args.metricas_porta,
+        "status_arquivo": args.status_arquivo,
+        "tarefas": args.tarefa,
+        "pontos_por_segundo": args.pontos_por_segundo,
+        "deteccao_atividade": False if args.sem_deteccao_atividade else None,
+    }
+    options.update({key: value for key, value in cli.items() if value is not None})
+    return options
+
+
+def ring_terminal_bell():
+    sys.stdout.write("\a")
+    sys.stdout.flush()
+
+
+def make_dispatch(engine, interval, stop_requested):
+    """Executa os comandos do canal de controle (chamado na thread do canal)"""
+    current = {"intervalo": interval}
+
+    def dispatch(command, value):
+        message = None
+        if command == "ativar":
+            if not engine.scheduler.active:
+                engine.start(current["intervalo"])
+                engine.log_event("Ciclos ativados pelo canal de controle.")
+            message = "Ciclos ativados."
+        elif command == "desativar":
+            if engine.scheduler.active:
+                engine.stop()
+                engine.log_event("Ciclos desativados pelo canal de controle.")
+            message = "Ciclos desativados."
+        elif command == "intervalo":
+            new_interval = int(value)
+            if new_interval < 1:
+                return {"ok": False, "mensagem": f"Intervalo inválido: {value}"}
+            current["intervalo"] = new_interval
+            engine.set_interval(new_interval)
+            engine.log_event(f"Intervalo alterado pelo canal de controle: {new_interval} segundos.")
+            message = f"Intervalo alterado para {new_interval} segundos."
+        elif command == "mostrar":
+            message = "MascoteApp já está em execução (sem interface)."
+        elif command == "encerrar":
+            stop_requested.set()
+            message = "Encerrando MascoteApp."
+        return {"ok": True, "mensagem": message, "status": engine.status()}
+
+    return dispatch
+
+
+def run_headless(args, control=None, profiler=None):
+    options = resolve_options(args)
+    interval = options["intervalo"]
+    if interval < 1:
+        print(f"Intervalo inválido: {interval}")
+        if control is not None:
+            control.close()
+        return 2
+    try:
+        jobs = [parse_job_spec(spec) for spec in options["tarefas"]] if options["tarefas"] else None
+    except ValueError as e:
+        print(e)
+        if control is not None:
+            control.close()
+        return 2
+
+    log_writer = LogWriter(options["log"])
+    event_store = EventStore(options["eventos_db"]) if options["eventos_db"] else None
+    engine = CycleEngine(create_backend(options["entrada"]), log_writer, event_store,
+                         bell=ring_terminal_bell, jobs=jobs)
+    engine.sound_enabled = options["som"]
+    engine.skip_when_active = options["deteccao_atividade"]
+    if options["pontos_por_segundo"]:
+        engine.points_per_second = options["pontos_por_segundo"]
+    exporters = start_exporters(engine.metrics, options["metricas_porta"], options["status_arquivo"])
+    if profiler is not None and profiler.wants_cycles:
+        engine.profiler = profiler
+
+    stop_requested = threading.Event()
+    flush_requested = threading.Event()
+
+    def on_stop_signal(signum, frame):
+        stop_requested.set()
+
+    def on_flush_signal(signum, frame):
+        flush_requested.set()
+
+    for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), on_stop_signal)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, on_flush_signal)
+    if control is not None:
+        control.dispatch = make_dispatch(engine, interval, stop_requested)
+
+    if jobs is None:
+        engine.log_event(f"Aplicação iniciada sem interface. Intervalo: {interval} segundos.")
+        engine.start(interval)
+        print(f"MascoteApp sem interface: ciclos a cada {interval} s (Ctrl+C para encerrar)")
+    else:
+        # Tarefas configuradas explicitamente mantêm os próprios períodos
+        description = "; ".join(job.describe() for job in jobs)
+        engine.log_event(f"Aplicação iniciada sem interface. Tarefas: {description}.")
+        engine.start()
+        print(f"MascoteApp sem interface: {description} (Ctrl+C para encerrar)")
+    if profiler is not None:
+        # Sem janela, o início termina quando os ciclos começam
+        profiler.finish_startup()
+    try:
+        while not stop_requested.wait(SIGNAL_POLL):
+            if flush_requested.is_set():
+                flush_requested.clear()
+                log_writer.flush()
+    finally:
+        if control is not None:
+            control.close()
+        engine.stop()
+        engine.log_event("Aplicação encerrada.")
+        for exporter in exporters:
+            exporter.close()
+        log_writer.close()
+        if event_store is not None:
+            event_store.close()
+    return 0
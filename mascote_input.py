@@ -0,0 +1,194 @@
+"""
+Backends de entrada (mouse e teclado) usados pelos ciclos
+
+Os ciclos não chamam o pyautogui diretamente: usam um backend com a interface
+size/position/move_to/click/press/idle_seconds.
+
+- PyAutoGuiBackend: usa o pyautogui, guarda em cache a geometria da tela
+  (renovada periodicamente ou quando invalidada) e controla a pausa de cada
+  chamada, evitando o atraso fixo de pyautogui.PAUSE em toda ação.
+- NullBackend: não toca no sistema; mantém um ponteiro virtual e, opcionalmente,
+  grava as chamadas. Permite rodar os ciclos sem tela, na velocidade máxima,
+  em testes e benchmarks.
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import sys
+import time
+
+# Tempo máximo de validade da geometria da tela em cache (s)
+GEOMETRY_TTL = 60.0
+
+# Pausa após cada chamada de entrada (s); o padrão do pyautogui seria 0.1
+DEFAULT_PAUSE = 0.0
+
+# Tela virtual do backend nulo
+DEFAULT_NULL_SIZE = (1920, 1080)
+
+
+class InputBackend:
+    name = "base"
+    # Movimentos e pausas entre eles levam tempo real; o backend nulo roda na velocidade máxima
+    real_time = True
+
+    def size(self):
+        """Dimensões da tela (largura, altura)"""
+        raise NotImplementedError
+
+    def position(self):
+        """Posição atual do ponteiro (x, y)"""
+        raise NotImplementedError
+
+    def move_to(self, x, y, duration=0.0):
+        raise NotImplementedError
+
+    def begin_path(self):
+        """Chamado uma vez antes dos move_point de um caminho (verificações de segurança)"""
+        pass
+
+    def move_point(self, x, y):
+        """Move para um ponto de um caminho já iniciado com begin_path"""
+        self.move_to(x, y)
+
+    def click(self):
+        raise NotImplementedError
+
+    def press(self, key):
+        raise NotImplementedError
+
+    def idle_seconds(self):
+        """Segundos desde a última entrada do sistema (mouse ou teclado); None se indisponível"""
+        return None
+
+    def invalidate(self):
+        """Descarta dados em cache (ex.: após mudança de resolução)"""
+        pass
+
+
+class PyAutoGuiBackend(InputBackend):
+    name = "pyautogui"
+
+    def __init__(self, pause=DEFAULT_PAUSE, geometry_ttl=GEOMETRY_TTL, clock=time.monotonic):
+        # Importado aqui: o backend nulo e o modo sem interface não dependem do pyautogui
+        import pyautogui
+        self._pyautogui = pyautogui
+        # Movimento de baixo nível da plataforma: uma única chamada ao sistema por ponto
+        self._move_point = getattr(getattr(pyautogui, "platformModule", None), "_moveTo", None)
+        self.pause = pause
+        self.geometry_ttl = geometry_ttl
+        self.clock = clock
+        self._size = None
+        self._size_checked = 0.0
+
+    def size(self):
+        now = self.clock()
+        if self._size is None or now - self._size_checked >= self.geometry_ttl:
+            self._size = tuple(self._pyautogui.size())
+            self._size_checked = now
+        return self._size
+
+    def position(self):
+        return tuple(self._pyautogui.position())
+
+    def move_to(self, x, y, duration=0.0):
+        # _pause=False desliga o pyautogui.PAUSE; a pausa passa a ser a deste backend
+        self._pyautogui.moveTo(x, y, duration=duration, _pause=False)
+        self._sleep_pause()
+
+    def begin_path(self):
+        # Fail-safe do pyautogui (ponteiro em um canto da tela) conferido uma vez por caminho
+        self._pyautogui.failSafeCheck()
+
+    def move_point(self, x, y):
+        # Sem moveTo: ele repetiria a verificação de segurança, position() e size() a cada ponto
+        if self._move_point is None:
+            self._pyautogui.moveTo(x, y, _pause=False)
+        else:
+            self._move_point(int(x), int(y))
+
+    def click(self):
+        self._pyautogui.click(_pause=False)
+        self._sleep_pause()
+
+    def press(self, key):
+        self._pyautogui.press(key, _pause=False)
+        self._sleep_pause()
+
+    def idle_seconds(self):
+        if sys.platform == "win32":
+            return _windows_idle_seconds()
+        return None  # Demais sistemas: a detecção de atividade usa só a posição do ponteiro
+
+    def invalidate(self):
+        self._size = None
+
+    def _sleep_pause(self):
+        if self.pause > 0:
+            time.sleep(self.pause)
+
+
+class NullBackend(InputBackend):
+    name = "nula"
+    real_time = False
+
+    def __init__(self, size=DEFAULT_NULL_SIZE, record=False):
+        self._size = tuple(size)
+        self._position = (self._size[0] // 2, self._size[1] // 2)
+        self.record = record
+        self.calls = []
+
+    def size(self):
+        return self._size
+
+    def position(self):
+        return self._position
+
+    def move_to(self, x, y, duration=0.0):
+        # Não dorme: a duração só é registrada
+        self._position = (int(x), int(y))
+        if self.record:
+            self.calls.append(("move_to", int(x), int(y), duration))
+
+    def click(self):
+        if self.record:
+            self.calls.append(("click",) + self._position)
+
+    def press(self, key):
+        if self.record:
+            self.calls.append(("press", key))
+
+
+_last_input_info = None
+
+
+def _windows_idle_seconds():
+    # GetLastInputInfo: uma chamada barata, sem laço de verificação
+    global _last_input_info
+    import ctypes
+    if _last_input_info is None:
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+        _last_input_info = LASTINPUTINFO()
+        _last_input_info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+    if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(_last_input_info)):
+        return None
+    # GetTickCount volta a zero a cada ~49 dias: a diferença é feita em 32 bits
+    elapsed_ms = (ctypes.windll.kernel32.GetTickCount() - _last_input_info.dwTime) & 0xFFFFFFFF
+    return elapsed_ms / 1000.0
+
+
+BACKENDS = {
+    PyAutoGuiBackend.name: PyAutoGuiBackend,
+    NullBackend.name: NullBackend,
+}
+
+
+def create_backend(name=PyAutoGuiBackend.name, **kwargs):
+    """Cria o backend de entrada pelo nome ("pyautogui" ou "nula")"""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Backend de entrada desconhecido: {name}") from None
+    return backend_class(**kwargs)
@@ -0,0 +1,145 @@
+"""
+Gravador assíncrono do log de ciclos
+
+As linhas são enfileiradas sem bloquear quem registra o evento e gravadas em lote
+por uma thread dedicada, que mantém um único arquivo aberto. O lote é gravado
+quando atinge um número de linhas ou quando o intervalo de descarga vence.
+Ao atingir o tamanho máximo, o arquivo é rotacionado e os segmentos antigos são
+compactados com gzip (cycle_log.txt.1.gz, cycle_log.txt.2.gz, ...).
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import gzip
+import os
+import queue
+import shutil
+import threading
+import time
+
+# Tamanho máximo do log antes da rotação (bytes)
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+
+# Quantidade de segmentos compactados mantidos
+DEFAULT_BACKUP_COUNT = 5
+
+# Intervalo máximo entre a chegada de uma linha e sua gravação (s)
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Quantidade de linhas que força a gravação imediata do lote
+DEFAULT_FLUSH_LINES = 64
+
+LOG_HEADER = "Log de ciclos iniciado.\n"
+
+# Sinal de encerramento da thread gravadora
+_STOP = object()
+
+
+class LogWriter:
+    def __init__(self, path="cycle_log.txt", max_bytes=DEFAULT_MAX_BYTES,
+                 backup_count=DEFAULT_BACKUP_COUNT, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 flush_lines=DEFAULT_FLUSH_LINES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.flush_lines = flush_lines
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._file = self._open()
+        self._thread = threading.Thread(target=self._run, name="mascote-log", daemon=True)
+        self._thread.start()
+
+    def write(self, line):
+        """Enfileira uma linha (sem quebra de linha final); nunca bloqueia em disco"""
+        if not self._closed:
+            self._queue.put(line)
+
+    def flush(self, timeout=None):
+        """Aguarda a gravação de todas as linhas enfileiradas até agora"""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Grava as linhas pendentes e fecha o arquivo (pode ser chamado mais de uma vez)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _open(self):
+        f = open(self.path, "ab")
+        if f.tell() == 0:
+            f.write(LOG_HEADER.encode("utf-8"))
+            f.flush()
+        return f
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            # Esvazia o que já estiver na fila para gravar em um único lote
+            while item is not None:
+                if item is _STOP:
+                    self._write_batch(batch)
+                    self._file.close()
+                    return
+                if isinstance(item, threading.Event):
+                    self._write_batch(batch)
+                    batch = []
+                    deadline = None
+                    item.set()
+                else:
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                    if len(batch) >= self.flush_lines:
+                        break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            if batch and (len(batch) >= self.flush_lines or time.monotonic() >= deadline):
+                self._write_batch(batch)
+                batch = []
+                deadline = None
+
+    def _write_batch(self, batch):
+        if not batch:
+            return
+        try:
+            self._file.write(("\n".join(batch) + "\n").encode("utf-8"))
+            self._file.flush()
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            # Falha de disco não pode derrubar a thread gravadora
+            print("Erro ao gravar log:", e)
+
+    def _rotate(self):
+        self._file.close()
+        try:
+            # Desloca os segmentos antigos: .1.gz -> .2.gz ... descartando o mais antigo
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}.gz"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}.gz")
+            if self.backup_count > 0:
+                with open(self.path, "rb") as src, gzip.open(f"{self.path}.1.gz", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+            os.remove(self.path)
+        finally:
+            # Mesmo se a rotação falhar, o log continua sendo gravado
+            self._file = self._open()
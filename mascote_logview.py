@@ -0,0 +1,282 @@
+"""
+Visualizador do log de ciclos
+
+LogTail lê o log de trás para frente em blocos de tamanho fixo: abrir o
+visualizador lê só as últimas linhas, então leva o mesmo tempo com um log de
+1 KB ou de 1 GB. Páginas mais antigas são lidas sob demanda, a partir do
+início da mais antiga já exibida, quando a lista chega ao topo. Linhas novas
+são acompanhadas pelo deslocamento no arquivo (só o que foi acrescentado é
+lido), e a rotação do log é detectada pela troca do arquivo.
+
+O filtro por tipo de evento é aplicado durante a leitura dos blocos: o arquivo
+nunca é carregado inteiro, e cada página examina no máximo MAX_SCAN_BYTES.
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import os
+
+# Tamanho dos blocos lidos de trás para frente (bytes)
+BLOCK_SIZE = 64 * 1024
+
+# Linhas por página (abertura e cada rolagem até o topo)
+PAGE_LINES = 200
+
+# Máximo examinado por página com filtro (bytes); a próxima rolagem continua dali
+MAX_SCAN_BYTES = 8 * 1024 * 1024
+
+# Intervalo de verificação de linhas novas com o visualizador aberto (ms)
+FOLLOW_MS = 1000
+
+# Tipos de evento do filtro: trechos procurados na linha (None: todas as linhas)
+FILTERS = {
+    "Todos": None,
+    "Ciclos": ("Ciclo automático", "Total de ciclos", "Ciclo ativado", "Ciclo desativado"),
+    "Mouse": ("Mouse movido", "movimentos"),
+    "Teclado": ("Tecla", "pressionad"),
+    "Teams": ("Teams",),
+    "Falhas": ("Erro", "Falha", "falh", "travada", "suspensa"),
+    "Puladas": ("adiada",),
+}
+
+
+def line_filter(name):
+    """Função que indica se uma linha pertence ao tipo de evento (None: sem filtro)"""
+    patterns = FILTERS.get(name)
+    if not patterns:
+        return None
+    return lambda line: any(pattern in line for pattern in patterns)
+
+
+class LogTail:
+    def __init__(self, path, block_size=BLOCK_SIZE):
+        self.path = path
+        self.block_size = block_size
+
+    def identity(self):
+        """(dispositivo, inode) do arquivo atual; muda quando o log é rotacionado"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def read_page(self, count=PAGE_LINES, before=None, match=None, max_scan=MAX_SCAN_BYTES):
+        """Lê até count linhas completas que terminam antes do deslocamento "before"
+
+        Sem "before", parte do fim do arquivo (uma linha final ainda sem quebra de
+        linha fica para o acompanhamento). Retorna (linhas da mais antiga para a
+        mais nova, início da mais antiga examinada, fim da última linha completa);
+        o segundo valor é o "before" da próxima página e 0 indica o início do arquivo.
+        """
+        try:
+            # Sem buffer: cada bloco é uma única leitura, sem ler adiante do que foi pedido
+            f = open(self.path, "rb", buffering=0)
+        except FileNotFoundError:
+            return [], 0, 0
+        with f:
+            if before is None:
+                before = f.seek(0, os.SEEK_END)
+                trim_partial = True
+            else:
+                trim_partial = False
+            end = before
+            limit = before      # Início da linha mais antiga já examinada
+            position = before   # Deslocamento no arquivo do primeiro byte de "pending"
+            pending = b""       # Bytes lidos; pending[:stop] ainda não foi separado em linhas
+            stop = 0
+            scanned = 0
+            lines = []
+            while len(lines) < count:
+                cut = pending.rfind(b"\n", 0, stop - 1) if stop > 1 else -1
+                if cut < 0 and position > 0:
+                    if scanned >= max_scan and limit < end:
+                        break  # Limite da página; só depois de avançar ao menos uma linha
+                    # Precisa de mais um bloco para completar a linha anterior
+                    size = min(self.block_size, position)
+                    position -= size
+                    f.seek(position)
+                    pending = f.read(size) + pending[:stop]
+                    stop = len(pending)
+                    scanned += size
+                    # A última linha ainda pode estar sendo gravada: só entra quando terminar
+                    newline = pending.rfind(b"\n") if trim_partial else -1
+                    if trim_partial and (newline >= 0 or position == 0):
+                        trim_partial = False
+                        partial = stop - (newline + 1)
+                        stop -= partial
+                        limit = end = before - partial
+                    continue
+                if stop == 0:
+                    break
+                raw = pending[cut + 1:stop]
+                stop = cut + 1
+                limit -= len(raw)
+                line = raw.rstrip(b"\r\n").decode("utf-8", errors="replace")
+                if line and (match is None or match(line)):
+                    lines.append(line)
+        lines.reverse()
+        return lines, limit, end
+
+    def read_new(self, start, match=None, max_bytes=MAX_SCAN_BYTES):
+        """Linhas completas acrescentadas depois de "start"
+
+        Retorna (linhas, novo deslocamento), ou None se o arquivo encolheu ou se
+        há mais que max_bytes novos (quem chama recarrega a partir do fim).
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return None
+        with f:
+            size = f.seek(0, os.SEEK_END)
+            if size < start or size - start > max_bytes:
+                return None
+            if size == start:
+                return [], start
+            f.seek(start)
+            data = f.read(size - start)
+        complete = data.rfind(b"\n") + 1
+        lines = [raw.rstrip(b"\r").decode("utf-8", errors="replace")
+                 for raw in data[:complete].split(b"\n")[:-1]]
+        lines = [line for line in lines if line and (match is None or match(line))]
+        return lines, start + complete
+
+
+class LogViewer:
+    """Janela com as últimas linhas do log, páginas antigas sob demanda e acompanhamento"""
+
+    def __init__(self, master, path, page_lines=PAGE_LINES):
+        import tkinter as tk
+        self.tk = tk
+        self.tail = LogTail(path)
+        self.page_lines = page_lines
+        self.match = None
+        self.oldest = 0          # Início da linha mais antiga carregada (0: início do arquivo)
+        self.follow_offset = 0   # Fim da última linha completa lida
+        self.file_identity = None
+        self.follow_job = None
+        self.loading = False
+        self.generation = 0      # Muda a cada recarga: buscas antigas em andamento são descartadas
+
+        self.window = tk.Toplevel(master)
+        self.window.title(f"Log - {os.path.basename(path)}")
+        self.window.geometry("640x420")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.frm_filtro = tk.Frame(self.window)
+        self.frm_filtro.pack(fill=tk.X)
+        self.lbl_filtro = tk.Label(self.frm_filtro, text="Tipo de evento:")
+        self.lbl_filtro.pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar(value="Todos")
+        self.opt_filtro = tk.OptionMenu(self.frm_filtro, self.filter_var, *FILTERS, command=self.on_filter)
+        self.opt_filtro.pack(side=tk.LEFT)
+        self.lbl_status = tk.Label(self.frm_filtro, text="")
+        self.lbl_status.pack(side=tk.RIGHT)
+
+        self.frm_lista = tk.Frame(self.window)
+        self.frm_lista.pack(fill=tk.BOTH, expand=True)
+        self.scrollbar = tk.Scrollbar(self.frm_lista, orient=tk.VERTICAL)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.lst_linhas = tk.Listbox(self.frm_lista, yscrollcommand=self.on_scroll)
+        self.lst_linhas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.config(command=self.lst_linhas.yview)
+
+        self.reload()
+
+    def reload(self):
+        """Recarrega a última página a partir do fim do arquivo"""
+        self.generation += 1
+        self.loading = False
+        self.file_identity = self.tail.identity()
+        lines, self.oldest, self.follow_offset = self.tail.read_page(self.page_lines, match=self.match)
+        self.lst_linhas.delete(0, self.tk.END)
+        for line in lines:
+            self.lst_linhas.insert(self.tk.END, line)
+        self.lst_linhas.see(self.tk.END)
+        self.schedule_follow()
+        if not lines and self.oldest > 0:
+            # Nada do filtro no fim do log: busca nas páginas anteriores sem esperar rolagem
+            self.loading = True
+            self.window.after_idle(self.load_older, self.generation)
+        self.update_status()
+
+    def on_filter(self, name):
+        self.match = line_filter(name)
+        self.reload()
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        # Chegou ao topo: carrega a página anterior depois que o Tk terminar a rolagem
+        if float(first) <= 0.0 and self.oldest > 0 and not self.loading:
+            self.loading = True
+            self.window.after_idle(self.load_older, self.generation)
+
+    def load_older(self, generation):
+        if generation != self.generation:
+            return  # Filtro trocado ou log recarregado: reload() já reiniciou a busca
+        try:
+            lines, self.oldest, _ = self.tail.read_page(self.page_lines, before=self.oldest, match=self.match)
+            for index, line in enumerate(lines):
+                self.lst_linhas.insert(index, line)
+            if lines:
+                # Mantém na tela a linha que estava no topo
+                self.lst_linhas.yview(len(lines))
+        finally:
+            self.loading = False
+        if not lines and self.oldest > 0:
+            # Trecho sem linhas do filtro: a lista não rola e on_scroll não seria chamado de novo,
+            # então a busca continua no próximo momento ocioso (um trecho de MAX_SCAN_BYTES por vez)
+            self.loading = True
+            self.window.after_idle(self.load_older, generation)
+        self.update_status()
+
+    def schedule_follow(self):
+        if self.follow_job is not None:
+            self.window.after_cancel(self.follow_job)
+        self.follow_job = self.window.after(FOLLOW_MS, self.follow)
+
+    def follow(self):
+        self.follow_job = None
+        new = None
+        if self.tail.identity() == self.file_identity:
+            new = self.tail.read_new(self.follow_offset, match=self.match)
+        if new is None:
+            # Log rotacionado, truncado ou com muito conteúdo novo: recomeça do fim
+            self.reload()
+            return
+        lines, self.follow_offset = new
+        if lines:
+            at_bottom = self.lst_linhas.yview()[1] >= 1.0
+            for line in lines:
+                self.lst_linhas.insert(self.tk.END, line)
+            if at_bottom:
+                self.lst_linhas.see(self.tk.END)
+            self.update_status()
+        self.schedule_follow()
+
+    def update_status(self):
+        if self.oldest == 0:
+            origin = "início do arquivo"
+        elif self.loading:
+            origin = "procurando linhas anteriores..."
+        else:
+            origin = "role até o topo para ver mais"
+        self.lbl_status.config(text=f"{self.lst_linhas.size()} linhas | {origin}")
+
+    def exists(self):
+        try:
+            return bool(self.window.winfo_exists())
+        except self.tk.TclError:
+            return False
+
+    def lift(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def close(self):
+        if self.follow_job is not None:
+            self.window.after_cancel(self.follow_job)
+            self.follow_job = None
+        self.window.destroy()
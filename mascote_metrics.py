@@ -0,0 +1,210 @@
+"""
+Métricas dos ciclos: histogramas de latência e contadores por ação
+
+Cada ação do ciclo (mouse, tecla, clique no Teams, Teams ativo, som) e o ciclo
+completo alimentam um histograma de latência com faixas fixas e contadores de
+sucesso/falha. Os contadores são pré-alocados: registrar um evento só incrementa
+inteiros, sem criar objetos por evento.
+
+As métricas podem ser expostas:
+- por um endpoint HTTP local (127.0.0.1) no formato texto do Prometheus;
+- por um arquivo de status JSON reescrito periodicamente.
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Limites superiores das faixas do histograma (s)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Intervalo padrão de reescrita do arquivo de status (s)
+DEFAULT_STATUS_INTERVAL = 30.0
+
+CYCLE = "ciclo"
+
+
+class LatencyHistogram:
+    __slots__ = ("buckets", "counts", "count", "total", "successes", "failures")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        # Uma posição por faixa mais a faixa +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.successes = 0
+        self.failures = 0
+
+    def observe(self, seconds, ok=True):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if ok:
+            self.successes += 1
+        else:
+            self.failures += 1
+
+    def snapshot(self):
+        return {
+            "contagem": self.count,
+            "soma_s": self.total,
+            "media_s": self.total / self.count if self.count else 0.0,
+            "sucessos": self.successes,
+            "falhas": self.failures,
+            "faixas": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts)),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self, actions=()):
+        # Escrita apenas pela thread de ciclos; leitores (HTTP, arquivo) só copiam valores
+        self._histograms = {name: LatencyHistogram() for name in (CYCLE,) + tuple(actions)}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def observe(self, action, seconds, ok=True):
+        self.histogram(action).observe(seconds, ok)
+
+    def observe_cycle(self, seconds, ok=True):
+        self._histograms[CYCLE].observe(seconds, ok)
+
+    def _actions(self):
+        # Cópia sob a trava: a thread de ciclos pode registrar uma ação nova durante a leitura
+        with self._lock:
+            return [(name, h) for name, h in sorted(self._histograms.items()) if name != CYCLE]
+
+    def snapshot(self):
+        return {
+            "inicio": self.started,
+            "atualizado": time.time(),
+            "ciclo": self._histograms[CYCLE].snapshot(),
+            "acoes": {name: histogram.snapshot() for name, histogram in self._actions()},
+        }
+
+    def render_prometheus(self):
+        """Formato texto de exposição do Prometheus (versão 0.0.4)"""
+        lines = []
+        series = [("mascote_cycle", {}, self._histograms[CYCLE])]
+        series += [("mascote_action", {"action": name}, histogram) for name, histogram in self._actions()]
+        for metric in ("mascote_cycle", "mascote_action"):
+            lines.append(f"# HELP {metric}_duration_seconds Duração em segundos")
+            lines.append(f"# TYPE {metric}_duration_seconds histogram")
+            for name, labels, histogram in series:
+                if name != metric:
+                    continue
+                counts = list(histogram.counts)
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, counts):
+                    cumulative += count
+                    lines.append(f"{metric}_duration_seconds_bucket{_labels(labels, le=bound)} {cumulative}")
+                cumulative += counts[-1]
+                lines.append(f"{metric}_duration_seconds_bucket{_labels(labels, le='+Inf')} {cumulative}")
+                lines.append(f"{metric}_duration_seconds_sum{_labels(labels)} {histogram.total}")
+                lines.append(f"{metric}_duration_seconds_count{_labels(labels)} {cumulative}")
+            lines.append(f"# HELP {metric}_results_total Execuções por resultado")
+            lines.append(f"# TYPE {metric}_results_total counter")
+            for name, labels, histogram in series:
+                if name != metric:
+                    continue
+                lines.append(f"{metric}_results_total{_labels(labels, result='ok')} {histogram.successes}")
+                lines.append(f"{metric}_results_total{_labels(labels, result='falha')} {histogram.failures}")
+        lines.append("# HELP mascote_start_time_seconds Início do processo (epoch)")
+        lines.append("# TYPE mascote_start_time_seconds gauge")
+        lines.append(f"mascote_start_time_seconds {self.started}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels, **extra):
+    items = dict(labels, **extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in items.items()) + "}"
+
+
+class MetricsServer:
+    def __init__(self, registry, port, host="127.0.0.1"):
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry_ref.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Sem saída no console a cada coleta
+
+        # Apenas localhost: as métricas não ficam expostas na rede
+        self._server = HTTPServer((host, port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mascote-metricas", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StatusFileWriter:
+    def __init__(self, registry, path, interval=DEFAULT_STATUS_INTERVAL):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="mascote-status", daemon=True)
+        self._thread.start()
+
+    def write(self):
+        # Arquivo temporário + troca atômica: leitores nunca veem o arquivo pela metade
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.registry.snapshot(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(5.0)
+
+    def _run(self):
+        while True:
+            try:
+                self.write()
+            except OSError as e:
+                print("Erro ao gravar arquivo de status:", e)
+            if self._stop.wait(self.interval):
+                # Última gravação com os valores finais
+                try:
+                    self.write()
+                except OSError:
+                    pass
+                return
+
+
+def start_exporters(registry, port=None, status_path=None, status_interval=DEFAULT_STATUS_INTERVAL):
+    """Inicia os exportadores configurados; retorna a lista de objetos a fechar"""
+    exporters = []
+    if port is not None:
+        exporters.append(MetricsServer(registry, port))
+    if status_path:
+        exporters.append(StatusFileWriter(registry, status_path, status_interval))
+    return exporters
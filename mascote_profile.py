@@ -0,0 +1,213 @@
+"""
+Perfil de desempenho do MascoteApp (--perfil)
+
+Grava em um diretório:
+- importacoes.txt / importacoes.collapsed: tempo de cada importação (próprio e
+  acumulado), medido desde antes das importações do mascote.py;
+- inicio.prof / inicio.collapsed: perfil do início até o primeiro quadro
+  desenhado (no modo sem interface, até o início dos ciclos);
+- ciclo_NNN_<tarefa>.prof / .collapsed: perfil das N primeiras execuções
+  agendadas (--perfil-ciclos).
+
+Os arquivos .prof são do cProfile (python -m pstats, snakeviz); os .collapsed
+têm uma pilha por linha ("a;b;c contagem") e servem direto para gerar flame
+graphs (flamegraph.pl, speedscope). As pilhas vêm de amostragem periódica da
+thread medida.
+
+Sem --perfil este módulo nem é importado; o único custo no caminho normal é um
+teste de atributo por execução agendada.
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import cProfile
+import collections
+import importlib.machinery
+import os
+import sys
+import threading
+import time
+
+# Diretório padrão dos perfis
+DEFAULT_DIRECTORY = "perfil"
+
+# Execuções agendadas perfiladas por padrão
+DEFAULT_CYCLES = 3
+
+# Intervalo entre amostras das pilhas (s)
+SAMPLE_INTERVAL = 0.002
+
+# Loaders criados um por módulo: só eles podem ser instrumentados sem afetar outros módulos
+_TIMED_LOADERS = (importlib.machinery.SourceFileLoader,
+                  importlib.machinery.SourcelessFileLoader,
+                  importlib.machinery.ExtensionFileLoader)
+
+
+def _frame_label(code):
+    # Sem ";" nem quebra de linha: separadores do formato collapsed
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+def write_collapsed(path, counts):
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in sorted(counts.items()):
+            f.write(f"{stack} {count}\n")
+
+
+class ImportTimer:
+    """Mede o tempo de execução de cada módulo importado (como python -X importtime)"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.records = []   # (pilha de nomes, próprio, acumulado) em segundos
+        self._stack = []    # [nome, início, tempo dos filhos]
+        self._lock = threading.Lock()
+        self._installed = False
+
+    def install(self):
+        if not self._installed:
+            sys.meta_path.insert(0, self)
+            self._installed = True
+
+    def uninstall(self):
+        if self._installed:
+            sys.meta_path.remove(self)
+            self._installed = False
+
+    def find_spec(self, fullname, path, target=None):
+        # Delega a busca aos demais finders e instrumenta só o loader encontrado
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        if isinstance(loader, _TIMED_LOADERS):
+            loader.exec_module = self._timed(fullname, loader.exec_module)
+        return spec
+
+    def _timed(self, name, exec_module):
+        def timed_exec_module(module):
+            if threading.current_thread() is not threading.main_thread():
+                return exec_module(module)
+            self._stack.append([name, self.clock(), 0.0])
+            try:
+                return exec_module(module)
+            finally:
+                name_, started, children = self._stack.pop()
+                total = self.clock() - started
+                if self._stack:
+                    self._stack[-1][2] += total
+                path = tuple(entry[0] for entry in self._stack) + (name_,)
+                with self._lock:
+                    self.records.append((path, total - children, total))
+        return timed_exec_module
+
+    def write(self, directory):
+        with self._lock:
+            records = list(self.records)
+        with open(os.path.join(directory, "importacoes.txt"), "w", encoding="utf-8") as f:
+            f.write(f"{'próprio (ms)':>13} {'acumulado (ms)':>15}  módulo\n")
+            for path, own, total in sorted(records, key=lambda record: record[2], reverse=True):
+                f.write(f"{own * 1000:13.2f} {total * 1000:15.2f}  {'  ' * (len(path) - 1)}{path[-1]}\n")
+        # Microssegundos próprios como "amostras": o flame graph mostra o acumulado por aninhamento
+        counts = {";".join(path): max(1, int(own * 1e6)) for path, own, _ in records}
+        write_collapsed(os.path.join(directory, "importacoes.collapsed"), counts)
+
+
+class StackSampler:
+    """Amostra periodicamente a pilha de uma thread (pilhas completas para flame graphs)"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="mascote-perfil", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.counts
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                self.counts[";".join(reversed(labels))] += 1
+
+
+class Recording:
+    """cProfile e amostragem da thread atual, gravados como <nome>.prof e <nome>.collapsed"""
+
+    def __init__(self, directory, name, interval=SAMPLE_INTERVAL):
+        self.directory = directory
+        self.name = name
+        self.profile = cProfile.Profile()
+        try:
+            self.profile.enable()
+        except ValueError:
+            # Outro perfilador já ativo: fica só a amostragem
+            self.profile = None
+        self.sampler = StackSampler(threading.get_ident(), interval).start()
+
+    def finish(self):
+        base = os.path.join(self.directory, self.name)
+        counts = self.sampler.stop()
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile.dump_stats(base + ".prof")
+        write_collapsed(base + ".collapsed", counts)
+
+
+class SessionProfiler:
+    def __init__(self, directory=DEFAULT_DIRECTORY, cycles=DEFAULT_CYCLES, import_timer=None):
+        self.directory = directory
+        self.cycles = cycles
+        self.import_timer = import_timer
+        self.cycles_done = 0
+        self._startup = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def wants_cycles(self):
+        return self.cycles_done < self.cycles
+
+    def start_startup(self):
+        self._startup = Recording(self.directory, "inicio")
+
+    def finish_startup(self):
+        # Idempotente: pode ser chamado pelo primeiro quadro e pelo encerramento
+        if self._startup is None:
+            return
+        self._startup.finish()
+        self._startup = None
+        if self.import_timer is not None:
+            self.import_timer.uninstall()
+            self.import_timer.write(self.directory)
+        print(f"Perfil do início gravado em {self.directory}")
+
+    def profile_cycle(self, name, run, *args):
+        """Executa run(*args) gravando o perfil como ciclo_NNN_<nome>"""
+        self.cycles_done += 1
+        recording = Recording(self.directory, f"ciclo_{self.cycles_done:03d}_{name}")
+        try:
+            return run(*args)
+        finally:
+            recording.finish()
+
+
+IMPORT_TIMER = ImportTimer()
+
@@ -0,0 +1,312 @@
+"""
+Agendador de tarefas sem deriva
+
+Cada tarefa (ciclo completo, tecla, movimento do mouse...) tem seu próprio
+período e, opcionalmente, uma variação aleatória (jitter: atraso sorteado entre 0 e o valor). As tarefas ficam em
+uma fila de prioridade (heap) ordenada pelo próximo prazo no relógio
+monotônico; o próximo prazo de uma tarefa é o anterior mais o período,
+independente de quanto a execução demorou.
+
+Uma única thread trabalhadora dorme em um Event até o prazo mais próximo ou até
+ser acordada por start/stop/add/remove: muitas tarefas custam uma thread e
+nenhuma verificação periódica, e desativar tem efeito imediato. Se uma
+execução travar (ex.: chamada ao sistema que não retorna), restart_worker()
+abandona a thread travada e cria outra no lugar; quando a antiga voltar, ela
+se vê interrompida e termina.
+
+Com um relógio virtual (simulação), o agendador é criado com threaded=False e
+conduzido por run_pending() na thread de quem chama; as pausas dentro das
+tarefas usam a função sleep informada, que apenas avança o relógio.
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+import weakref
+
+
+class Job:
+    """Tarefa periódica com contadores próprios"""
+
+    def __init__(self, name, action, period, jitter=0.0):
+        if period <= 0:
+            raise ValueError(f"Período inválido para a tarefa {name}: {period}")
+        if jitter < 0:
+            raise ValueError(f"Variação inválida para a tarefa {name}: {jitter}")
+        self.name = name
+        self.action = action
+        self.period = period
+        self.jitter = jitter
+        self.base = None       # Prazo sem variação; a sequência de prazos não acumula o jitter
+        self.deadline = None   # Prazo efetivo (base + variação sorteada)
+        self._entry = None     # Sequência da entrada válida no heap (None se fora do heap)
+        self.reset()
+
+    def reset(self):
+        self.runs = 0
+        self.successes = 0
+        self.failures = 0
+        self.skips = 0  # Execuções adiadas (ex.: usuário ativo)
+        self.last_duration = None
+
+    def record(self, ok, duration):
+        self.runs += 1
+        if ok:
+            self.successes += 1
+        else:
+            self.failures += 1
+        self.last_duration = duration
+
+    def record_skip(self):
+        self.skips += 1
+
+    def describe(self):
+        jitter = f" (+até {self.jitter:g}s)" if self.jitter else ""
+        return f"{self.name}: a cada {self.period:g}s{jitter}"
+
+
+class JobScheduler:
+    def __init__(self, callback, clock=time.monotonic, rng=None, threaded=True, sleep=None):
+        # callback(job) é chamado na thread trabalhadora a cada prazo vencido
+        self.callback = callback
+        self.clock = clock
+        self.rng = rng or random.Random()
+        # Sem thread trabalhadora, as tarefas só executam em run_pending()
+        self.threaded = threaded
+        # Pausa dentro das tarefas; None espera no Event de interrupção (tempo real)
+        self.sleep = sleep
+        self._jobs = {}
+        self._heap = []  # Entradas (prazo, sequência, tarefa); entradas obsoletas são descartadas ao sair
+        self._sequence = itertools.count()
+        self._active = False
+        self._generation = 0  # Incrementada a cada start/stop para invalidar execuções em curso
+        self._running_generation = None
+        self._running_job = None
+        self._wake = threading.Event()
+        self._interrupt = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._abandoned = weakref.WeakSet()  # Threads trabalhadoras substituídas por restart_worker
+
+    @property
+    def active(self):
+        return self._active
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def get(self, name):
+        return self._jobs.get(name)
+
+    def add(self, job):
+        """Adiciona (ou substitui) uma tarefa; com o agendador ativo ela entra no heap na hora"""
+        with self._lock:
+            previous = self._jobs.get(job.name)
+            if previous is not None:
+                self._discard(previous)
+            self._jobs[job.name] = job
+            if self._active:
+                self._schedule(job, self.clock())
+        self._wake.set()
+        return job
+
+    def remove(self, name):
+        with self._lock:
+            job = self._jobs.pop(name, None)
+            if job is None:
+                return None
+            self._discard(job)
+        self._wake.set()
+        return job
+
+    def set_period(self, name, period):
+        with self._lock:
+            job = self._jobs.get(name)
+            if job is None:
+                return
+            if period <= 0:
+                raise ValueError(f"Período inválido para a tarefa {name}: {period}")
+            job.period = period
+            if self._active:
+                self._schedule(job, self.clock())
+        self._wake.set()
+
+    def start(self):
+        """Ativa as tarefas; cada uma executa pela primeira vez após um período completo"""
+        with self._lock:
+            self._active = True
+            self._generation += 1
+            self._heap = []
+            now = self.clock()
+            for job in self._jobs.values():
+                job.reset()
+                self._schedule(job, now)
+            # Uma única thread trabalhadora, criada sob demanda e reaproveitada
+            if self.threaded and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mascote-tarefas", daemon=True)
+                self._thread.start()
+        self._interrupt.set()
+        self._wake.set()
+
+    def stop(self):
+        """Desativa as tarefas, interrompendo a execução em curso no próximo ponto de verificação"""
+        with self._lock:
+            self._active = False
+            self._generation += 1
+            self._heap = []
+            for job in self._jobs.values():
+                job.deadline = job.base = job._entry = None
+        self._interrupt.set()
+        self._wake.set()
+
+    def remaining(self, name=None):
+        """Segundos até a próxima execução (de qualquer tarefa ou da tarefa indicada); None se parado"""
+        if name is not None:
+            job = self._jobs.get(name)
+            deadlines = [job.deadline] if job is not None else []
+        else:
+            deadlines = [job.deadline for job in list(self._jobs.values())]
+        deadlines = [deadline for deadline in deadlines if deadline is not None]
+        if not self._active or not deadlines:
+            return None
+        return max(0.0, min(deadlines) - self.clock())
+
+    def interrupted(self):
+        """Indica se a execução em curso foi cancelada por stop/start ou pela remoção da tarefa
+
+        Tarefas executadas diretamente, fora da thread do agendador, nunca são interrompidas.
+        """
+        if threading.current_thread() in self._abandoned:
+            return True
+        generation = self._running_generation
+        if generation is None:
+            return False
+        job = self._running_job
+        return (not self._active or generation != self._generation
+                or (job is not None and self._jobs.get(job.name) is not job))
+
+    def pause(self, seconds):
+        """Pausa dentro de uma execução; retorna False se ela foi interrompida"""
+        if self.interrupted():
+            return False
+        if self.sleep is not None:
+            self.sleep(seconds)
+        else:
+            self._interrupt.wait(seconds)
+        return not self.interrupted()
+
+    def restart_worker(self):
+        """Abandona a thread trabalhadora (travada em uma execução) e cria outra no lugar
+
+        Retorna a tarefa que estava em execução (ou None). A execução abandonada
+        não é cancelada, mas passa a ver interrupted() verdadeiro quando voltar.
+        """
+        with self._lock:
+            stuck = self._thread
+            if stuck is None:
+                return None
+            job = self._running_job
+            self._abandoned.add(stuck)
+            self._running_generation = None
+            self._running_job = None
+            self._thread = threading.Thread(target=self._run, name="mascote-tarefas", daemon=True)
+            self._thread.start()
+        self._wake.set()
+        return job
+
+    def next_deadline(self):
+        """Prazo mais próximo no relógio do agendador; None se parado ou sem tarefas"""
+        with self._lock:
+            self._drop_stale()
+            if not self._active or not self._heap:
+                return None
+            return self._heap[0][0]
+
+    def run_pending(self):
+        """Executa na thread atual as tarefas com prazo vencido; retorna quantas executaram"""
+        executed = 0
+        while True:
+            with self._lock:
+                self._drop_stale()
+                if not self._active or not self._heap or self._heap[0][0] > self.clock():
+                    return executed
+                job = self._pop_due(self._generation)
+            self._execute(job)
+            executed += 1
+
+    def _schedule(self, job, now):
+        # Chamado com a trava: (re)insere a tarefa com prazo a partir de agora
+        job.base = now + job.period
+        self._push(job)
+
+    def _push(self, job):
+        job.deadline = job.base + (self.rng.uniform(0, job.jitter) if job.jitter else 0.0)
+        job._entry = next(self._sequence)
+        heapq.heappush(self._heap, (job.deadline, job._entry, job))
+
+    def _discard(self, job):
+        # A entrada continua no heap, mas deixa de valer; se a tarefa estiver executando, é interrompida
+        job._entry = job.deadline = job.base = None
+        if self._running_job is job:
+            self._interrupt.set()
+
+    def _drop_stale(self):
+        # Chamado com a trava: descarta entradas obsoletas (tarefa removida ou reagendada)
+        while self._heap and self._heap[0][1] != self._heap[0][2]._entry:
+            heapq.heappop(self._heap)
+
+    def _pop_due(self, generation):
+        # Chamado com a trava: retira a tarefa do topo e agenda o próximo prazo
+        _, _, job = heapq.heappop(self._heap)
+        # Próximo prazo a partir do prazo anterior, não do fim da execução
+        job.base += job.period
+        now = self.clock()
+        if job.base <= now:
+            # Execução atrasou mais que um período: pula os prazos perdidos
+            job.base = now + job.period
+        self._push(job)
+        self._running_generation = generation
+        self._running_job = job
+        self._interrupt.clear()
+        return job
+
+    def _execute(self, job):
+        try:
+            self.callback(job)
+        except Exception as e:
+            print(f"Erro na tarefa {job.name}:", e)
+        finally:
+            # Uma thread abandonada não mexe no estado da que a substituiu
+            if threading.current_thread() not in self._abandoned:
+                self._running_generation = None
+                self._running_job = None
+
+    def _run(self):
+        while self._thread is threading.current_thread():
+            # Limpa antes de ler o estado: uma mudança posterior acorda a espera seguinte
+            self._wake.clear()
+            with self._lock:
+                self._drop_stale()
+                active = self._active
+                generation = self._generation
+                deadline = self._heap[0][0] if self._heap else None
+            if not active or deadline is None:
+                self._wake.wait()
+                continue
+            timeout = deadline - self.clock()
+            if timeout > 0:
+                self._wake.wait(timeout)
+                continue
+
+            with self._lock:
+                self._drop_stale()
+                if generation != self._generation or not self._heap or self._heap[0][0] != deadline:
+                    continue
+                job = self._pop_due(generation)
+            self._execute(job)
@@ -0,0 +1,153 @@
+"""
+Simulação determinística de longa duração do motor de ciclos
+
+Executa o CycleEngine com um relógio virtual, um gerador aleatório com semente e
+o backend de entrada nulo: as esperas do agendador e as pausas dentro dos
+movimentos apenas avançam o relógio, então uma semana de ciclos de 5 minutos
+roda em segundos. Para a mesma semente e as mesmas opções, o log gerado é
+sempre o mesmo (inclusive os horários, que partem de uma data fixa); o resumo
+SHA-256 das linhas impresso ao final permite comparar execuções.
+
+Uso:
+    python mascote_simulation.py --dias 7 --semente 42
+    python mascote_simulation.py --dias 30 --tarefa tecla:60:5 --tarefa mouse:45
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import argparse
+import datetime
+import hashlib
+import os
+import random
+import sys
+import time
+from mascote_engine import CycleEngine, parse_job_spec
+from mascote_events import EventStore
+from mascote_input import NullBackend
+from mascote_log import LogWriter
+
+# Início do relógio virtual: datas fixas tornam o log reproduzível
+DEFAULT_START = datetime.datetime(2025, 10, 6, 8, 0, 0)
+
+DEFAULT_LOG = "simulacao_log.txt"
+
+
+class VirtualClock:
+    """Relógio que só avança quando pedido (sleep ou advance_to)"""
+
+    def __init__(self, start=DEFAULT_START):
+        self.start = start
+        self.elapsed = 0.0
+
+    def monotonic(self):
+        return self.elapsed
+
+    def now(self):
+        return self.start + datetime.timedelta(seconds=self.elapsed)
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.elapsed += seconds
+
+    def advance_to(self, instant):
+        self.elapsed = max(self.elapsed, instant)
+
+
+class DigestLog:
+    """Repassa as linhas ao gravador e acumula o resumo SHA-256 e a contagem"""
+
+    def __init__(self, log_writer):
+        self.log_writer = log_writer
+        self.digest = hashlib.sha256()
+        self.lines = 0
+
+    def write(self, line):
+        self.digest.update(line.encode("utf-8") + b"\n")
+        self.lines += 1
+        self.log_writer.write(line)
+
+
+def run_simulation(days=7.0, seed=0, interval=300, jobs=None, log_path=DEFAULT_LOG,
+                   events_path=None, points_per_second=None, sound=False):
+    """Simula "days" dias de operação e retorna um resumo da execução"""
+    # Log novo a cada simulação: o arquivo é aberto em modo de acréscimo
+    if os.path.exists(log_path):
+        os.remove(log_path)
+    clock = VirtualClock()
+    log_writer = LogWriter(log_path)
+    digest_log = DigestLog(log_writer)
+    event_store = EventStore(events_path) if events_path else None
+    engine = CycleEngine(NullBackend(), digest_log, event_store, bell=lambda: None,
+                         jobs=jobs, clock=clock, rng=random.Random(seed))
+    engine.sound_enabled = sound
+    if points_per_second:
+        engine.points_per_second = points_per_second
+
+    horizon = days * 86400
+    started = time.perf_counter()
+    engine.log_event(f"Simulação iniciada. Semente: {seed}. Duração: {days:g} dias.")
+    engine.start(None if jobs else interval)
+    try:
+        while True:
+            deadline = engine.scheduler.next_deadline()
+            if deadline is None or deadline > horizon:
+                break
+            clock.advance_to(deadline)
+            engine.scheduler.run_pending()
+        clock.advance_to(horizon)
+    finally:
+        engine.stop()
+        engine.log_event("Simulação encerrada.")
+        log_writer.close()
+        if event_store is not None:
+            event_store.close()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "dias": days,
+        "semente": seed,
+        "ciclos": engine.cycle_count,
+        "tarefas": [(job.name, job.runs, job.failures, job.skips) for job in engine.scheduler.jobs()],
+        "linhas": digest_log.lines,
+        "sha256": digest_log.digest.hexdigest(),
+        "tempo_real_s": elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação determinística do motor de ciclos")
+    parser.add_argument("--dias", type=float, default=7.0, help="Duração simulada em dias (padrão: 7)")
+    parser.add_argument("--semente", type=int, default=0, help="Semente do gerador aleatório (padrão: 0)")
+    parser.add_argument("--intervalo", type=int, default=300,
+                        help="Intervalo do ciclo completo em segundos (padrão: 300)")
+    parser.add_argument("--tarefa", action="append", metavar="[NOME=]ACAO:PERIODO[:VARIACAO]",
+                        help="Tarefa periódica (pode repetir); substitui o ciclo completo")
+    parser.add_argument("--pontos-por-segundo", type=int, default=None,
+                        help="Pontos por segundo nos movimentos do mouse")
+    parser.add_argument("--som", action="store_true", help="Inclui a ação de som nos ciclos")
+    parser.add_argument("--log", default=DEFAULT_LOG, help=f"Arquivo de log (padrão: {DEFAULT_LOG})")
+    parser.add_argument("--eventos-db", default=None, help="Grava também o histórico em SQLite")
+    args = parser.parse_args(argv)
+    if args.dias <= 0 or args.intervalo < 1:
+        parser.error("dias e intervalo devem ser positivos")
+    try:
+        jobs = [parse_job_spec(spec) for spec in args.tarefa] if args.tarefa else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    result = run_simulation(args.dias, args.semente, args.intervalo, jobs, args.log,
+                            args.eventos_db, args.pontos_por_segundo, args.som)
+    print(f"🕒 {result['dias']:g} dias simulados em {result['tempo_real_s']:.2f} s "
+          f"(semente {result['semente']})")
+    print(f"🔁 Ciclos completos: {result['ciclos']}")
+    for name, runs, failures, skips in result["tarefas"]:
+        print(f"   {name}: execuções {runs}, falhas {failures}, puladas {skips}")
+    print(f"📝 {result['linhas']} linhas em {args.log}")
+    print(f"🔑 SHA-256 das linhas: {result['sha256']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Canal de estado entre a thread de ciclos e a interface Tk
+
+A thread de ciclos nunca toca nos widgets: ela publica mudanças de estado
+(contagem de ciclos, resultado do último ciclo, pedido de som) em uma fila sem
+trava. A thread do Tk drena a fila em um único callback do root.after, mantém
+apenas o valor mais recente de cada chave e só atualiza os widgets cujo valor
+realmente mudou.
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+from collections import deque
+
+
+class StateChannel:
+    def __init__(self):
+        # deque.append/popleft são atômicos no CPython: dispensam trava
+        self._queue = deque()
+        self._shown = {}
+
+    def publish(self, key, value):
+        """Publica um novo valor para a chave (chamado de qualquer thread)"""
+        self._queue.append((key, value))
+
+    def drain(self):
+        """Retorna {chave: valor mais recente} apenas das chaves que mudaram desde a última exibição"""
+        latest = {}
+        while True:
+            try:
+                key, value = self._queue.popleft()
+            except IndexError:
+                break
+            latest[key] = value
+        changed = {}
+        for key, value in latest.items():
+            if self._shown.get(key, self) != value:
+                self._shown[key] = value
+                changed[key] = value
+        return changed
+
+    def pending(self):
+        return bool(self._queue)
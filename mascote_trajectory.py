@@ -0,0 +1,144 @@
+"""
+Trajetórias do ponteiro pré-calculadas
+
+Em vez de entregar cada movimento ao pyautogui.moveTo(..., duration=...), que
+interpola em Python e faz uma chamada ao sistema a cada passo minúsculo, o
+caminho inteiro é gerado de uma vez (curva de Bézier cúbica com aceleração e
+desaceleração suaves) e reproduzido por um único laço de tempo, com no máximo
+N pontos por segundo. Cada ponto é uma única chamada de movimento ao sistema; a
+verificação de segurança do pyautogui é feita uma vez por caminho.
+
+As formas são calculadas em um sistema normalizado (de (0, 0) a (1, 0)) e
+guardadas em cache: uma mesma forma serve para qualquer origem, destino e
+distância, só muda a transformação final. Com NumPy o cálculo é vetorizado; sem
+ele, usa o mesmo algoritmo em Python puro.
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import functools
+import math
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional
+    np = None
+
+# Limite padrão de pontos enviados ao sistema por segundo de movimento (o tween do
+# pyautogui.moveTo também não passa de 20 passos por segundo)
+DEFAULT_POINTS_PER_SECOND = 20
+
+# Curvaturas disponíveis (deslocamento lateral dos pontos de controle em relação à
+# distância); um conjunto pequeno mantém as formas reaproveitáveis no cache
+CURVES = (-0.3, -0.15, -0.05, 0.05, 0.15, 0.3)
+
+# Curvatura dos arcos do "circular_movement"
+ARC_CURVES = (-0.6, -0.45, 0.45, 0.6)
+
+# Formas normalizadas mantidas em cache
+SHAPE_CACHE_SIZE = 256
+
+
+def _ease(t):
+    # Aceleração e desaceleração suaves (smoothstep)
+    return t * t * (3 - 2 * t)
+
+
+@functools.lru_cache(maxsize=SHAPE_CACHE_SIZE)
+def unit_shape(curve, steps):
+    """Pontos (u, v) de uma curva de (0, 0) a (1, 0) com a curvatura indicada
+
+    Os pontos de controle ficam a 1/3 e 2/3 do caminho, deslocados lateralmente
+    por "curve". Retorna uma tupla de arrays (NumPy) ou de tuplas (Python puro).
+    """
+    c1 = (1 / 3, curve)
+    c2 = (2 / 3, curve)
+    if np is not None:
+        t = _ease(np.linspace(0.0, 1.0, steps + 1)[1:])
+        b = 3 * (1 - t) ** 2 * t
+        c = 3 * (1 - t) * t ** 2
+        d = t ** 3
+        u = b * c1[0] + c * c2[0] + d
+        v = b * c1[1] + c * c2[1]
+        u.flags.writeable = False
+        v.flags.writeable = False
+        return u, v
+    points = []
+    for i in range(1, steps + 1):
+        t = _ease(i / steps)
+        b = 3 * (1 - t) ** 2 * t
+        c = 3 * (1 - t) * t ** 2
+        d = t ** 3
+        points.append((b * c1[0] + c * c2[0] + d, b * c1[1] + c * c2[1]))
+    return tuple(points)
+
+
+def plan_steps(distance, duration, points_per_second=DEFAULT_POINTS_PER_SECOND):
+    # No máximo um ponto por pixel percorrido e por 1/N s de movimento
+    return max(1, min(int(math.ceil(duration * points_per_second)), int(distance)))
+
+
+def build_path(start, end, duration, curve=0.0, points_per_second=DEFAULT_POINTS_PER_SECOND):
+    """Lista de pontos inteiros (x, y) após start até end, sem repetições consecutivas"""
+    x0, y0 = start
+    dx = end[0] - x0
+    dy = end[1] - y0
+    steps = plan_steps(math.hypot(dx, dy), duration, points_per_second)
+    shape = unit_shape(curve, steps)
+    if np is not None:
+        u, v = shape
+        # (u, v) no sistema normalizado → tela: eixo u ao longo de (dx, dy), eixo v perpendicular
+        xs = np.rint(x0 + u * dx - v * dy).astype(int)
+        ys = np.rint(y0 + u * dy + v * dx).astype(int)
+        # Descarta pontos repetidos (inclusive iguais à origem): não geram chamadas ao sistema
+        keep = np.empty(len(xs), dtype=bool)
+        keep[0] = xs[0] != x0 or ys[0] != y0
+        keep[1:] = (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1])
+        path = list(zip(xs[keep].tolist(), ys[keep].tolist()))
+    else:
+        path = []
+        previous = (x0, y0)
+        for u, v in shape:
+            point = (int(round(x0 + u * dx - v * dy)), int(round(y0 + u * dy + v * dx)))
+            if point != previous:
+                path.append(point)
+                previous = point
+    # O último ponto é sempre exatamente o destino
+    if path:
+        path[-1] = (int(end[0]), int(end[1]))
+    else:
+        path.append((int(end[0]), int(end[1])))
+    return path
+
+
+def replay(path, duration, move, wait=time.sleep, clock=time.monotonic):
+    """Reproduz um caminho em um único laço de tempo
+
+    move(x, y) é chamado uma vez por ponto; wait(segundos) dorme até o próximo
+    ponto e retorna False para interromper. Pontos atrasados são pulados (exceto
+    o destino), então um atraso não estica o movimento. Retorna o número de
+    pontos enviados.
+    """
+    if not path:
+        return 0
+    interval = duration / len(path)
+    started = clock()
+    sent = 0
+    last = len(path) - 1
+    index = 0
+    while index <= last:
+        due = started + (index + 1) * interval
+        now = clock()
+        if index < last and now >= due + interval:
+            # Atrasado mais de um ponto: salta direto para o ponto do instante atual
+            index = min(last, int((now - started) / interval))
+            continue
+        if now < due and wait(due - now) is False:
+            return sent
+        x, y = path[index]
+        move(x, y)
+        sent += 1
+        index += 1
+    return sent
@@ -0,0 +1,119 @@
+"""
+Vigia de ações travadas e disjuntor de ações com falhas seguidas
+
+Watchdog: cada ação do ciclo é armada com um prazo antes de executar e
+desarmada ao terminar. Uma thread dorme até o prazo da ação armada (sem
+verificação periódica); se a ação ainda não terminou, on_stall(nome, decorrido)
+é chamado para registrar o travamento e substituir a thread trabalhadora.
+
+CircuitBreaker: após algumas falhas seguidas a ação é suspensa por um tempo que
+dobra a cada nova falha (até um limite); depois da suspensão uma única tentativa
+decide se ela volta ao normal. Assim uma ação que sempre falha (ex.: clique no
+Teams fechado) deixa de consumir o tempo dos ciclos.
+
+Autor: Christian Vladimir Uhdre Mulato
+Data: Campo Largo, Outubro de 2025.
+"""
+
+import itertools
+import threading
+import time
+
+# Falhas seguidas que suspendem uma ação
+BREAKER_THRESHOLD = 3
+
+# Primeira suspensão (s); dobra a cada falha seguinte, até o máximo
+BREAKER_BACKOFF = 300.0
+BREAKER_MAX_BACKOFF = 3600.0
+
+
+class Watchdog:
+    def __init__(self, on_stall, clock=time.monotonic):
+        # on_stall(nome, decorrido) é chamado na thread do vigia
+        self.on_stall = on_stall
+        self.clock = clock
+        self._armed = None  # (ficha, nome, início, prazo) da ação em execução
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._thread = None
+
+    def begin(self, name, timeout):
+        """Arma o vigia para a ação que vai executar; retorna a ficha usada em end()"""
+        token = next(self._tokens)
+        now = self.clock()
+        with self._lock:
+            self._armed = (token, name, now, now + timeout)
+            # Thread criada só na primeira ação vigiada
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mascote-vigia", daemon=True)
+                self._thread.start()
+        self._changed.set()
+        return token
+
+    def end(self, token):
+        """Desarma o vigia; retorna False se a ação já tinha sido dada como travada"""
+        with self._lock:
+            if self._armed is None or self._armed[0] != token:
+                return False
+            self._armed = None
+            return True
+
+    def _run(self):
+        while True:
+            self._changed.clear()
+            with self._lock:
+                armed = self._armed
+            if armed is None:
+                self._changed.wait()
+                continue
+            token, name, started, deadline = armed
+            timeout = deadline - self.clock()
+            if timeout > 0:
+                self._changed.wait(timeout)
+                continue
+            with self._lock:
+                if self._armed is None or self._armed[0] != token:
+                    continue
+                self._armed = None
+            try:
+                self.on_stall(name, self.clock() - started)
+            except Exception as e:
+                print(f"Erro ao tratar o travamento de {name}:", e)
+
+
+class CircuitBreaker:
+    def __init__(self, threshold=BREAKER_THRESHOLD, backoff=BREAKER_BACKOFF,
+                 max_backoff=BREAKER_MAX_BACKOFF, clock=time.monotonic):
+        self.threshold = threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.failures = 0        # Falhas seguidas
+        self.trips = 0           # Suspensões seguidas (a espera dobra a cada uma)
+        self.open_until = None   # Fim da suspensão atual (None: ação liberada)
+        self.last_backoff = 0.0
+
+    @property
+    def is_open(self):
+        return self.open_until is not None
+
+    def allow(self):
+        """Indica se a ação pode executar agora (liberada ou suspensão vencida)"""
+        return self.open_until is None or self.clock() >= self.open_until
+
+    def record(self, ok):
+        """Registra o resultado; retorna "suspensa" ou "liberada" quando o estado muda"""
+        if ok:
+            was_open = self.open_until is not None
+            self.failures = self.trips = 0
+            self.open_until = None
+            return "liberada" if was_open else None
+        self.failures += 1
+        if self.open_until is None and self.failures < self.threshold:
+            return None
+        # Limite atingido ou nova falha na tentativa após a suspensão
+        self.last_backoff = min(self.max_backoff, self.backoff * 2 ** self.trips)
+        self.trips += 1
+        self.open_until = self.clock() + self.last_backoff
+        return "suspensa"